@@ -0,0 +1,142 @@
+"""
+Benchmarks for the GOES/XRS temperature and emission measure calculation and
+flare class conversions in `sunkit_instruments.goes_xrs`.
+"""
+import numpy as np
+import pandas as pd
+from scipy.io import readsav
+
+import astropy.units as u
+
+from sunpy import timeseries as ts
+
+from sunkit_instruments import goes_xrs
+from sunkit_instruments.data.test import get_test_filepath
+from sunkit_instruments.goes_xrs.goes_chianti_tem import _manage_goesr_detectors
+
+DURATIONS = {"day": 86_400, "year": 365 * 86_400}
+
+
+def make_xrs_timeseries(satellite_number, duration):
+    """
+    A synthetic 1 s GOES/XRS timeseries with a flare every 6 hours.
+
+    The flares range from B to X class, and for GOES-R the secondary detectors are
+    used during the larger flares, as for the real data.
+    """
+    n_samples = DURATIONS[duration]
+    rng = np.random.default_rng(1234)
+    times = pd.date_range("2017-09-10", periods=n_samples, freq="1s")
+    dt = (np.arange(n_samples) % 21_600) - 10_800
+    profile = np.where(dt < 0, np.exp(-((dt / 600) ** 2)), np.exp(-dt / 900))
+    peak = 10 ** rng.uniform(-6.5, -3.5, n_samples // 21_600 + 1)[np.arange(n_samples) // 21_600]
+    xrsb = 1e-7 + peak * profile
+    xrsa = xrsb * (0.01 + 0.2 * profile)
+    data = {"xrsa": xrsa, "xrsb": xrsb}
+    units = {"xrsa": u.W / u.m**2, "xrsb": u.W / u.m**2}
+    if satellite_number >= 16:
+        data["xrsa_quality"] = np.zeros(n_samples, dtype=np.uint8)
+        data["xrsb_quality"] = np.zeros(n_samples, dtype=np.uint8)
+        data["xrsa_primary_chan"] = np.where(xrsa > 1e-5, 2, 1).astype(np.uint8)
+        data["xrsb_primary_chan"] = np.where(xrsb > 1e-4, 2, 1).astype(np.uint8)
+        units.update({name: u.dimensionless_unscaled for name in data if name not in units})
+    header = {"TELESCOP": f"GOES {satellite_number}"}
+    return ts.TimeSeries(pd.DataFrame(data, index=times), header, units)
+
+
+class TemperatureEM:
+    params = [[15, 16], ["day", "year"]]
+    param_names = ["satellite_number", "duration"]
+    timeout = 600
+
+    def setup(self, satellite_number, duration):
+        self.goes_ts = make_xrs_timeseries(satellite_number, duration)
+        # Compute once such that the response table is downloaded and the splines and
+        # lookup tables are cached, so they are not included in the timings
+        goes_xrs.calculate_temperature_em(self.goes_ts.truncate(0, 10))
+        goes_xrs.calculate_temperature_em(self.goes_ts.truncate(0, 10), fast=True)
+
+    def time_calculate_temperature_em(self, satellite_number, duration):
+        goes_xrs.calculate_temperature_em(self.goes_ts)
+
+    def time_calculate_temperature_em_fast(self, satellite_number, duration):
+        goes_xrs.calculate_temperature_em(self.goes_ts, fast=True)
+
+    def peakmem_calculate_temperature_em(self, satellite_number, duration):
+        goes_xrs.calculate_temperature_em(self.goes_ts)
+
+
+class GOESRDetectors:
+    params = [["day", "year"]]
+    param_names = ["duration"]
+    timeout = 600
+
+    def setup(self, duration):
+        self.goes_ts = make_xrs_timeseries(16, duration)
+        _manage_goesr_detectors(self.goes_ts.truncate(0, 10), 16)
+
+    def time_manage_goesr_detectors(self, duration):
+        _manage_goesr_detectors(self.goes_ts, 16)
+
+    def peakmem_manage_goesr_detectors(self, duration):
+        _manage_goesr_detectors(self.goes_ts, 16)
+
+
+class FlareClass:
+    params = [[1_000, 1_000_000]]
+    param_names = ["n_flares"]
+
+    def setup(self, n_flares):
+        rng = np.random.default_rng(1234)
+        self.fluxes = 10 ** rng.uniform(-9, -3, n_flares) * u.W / u.m**2
+        self.classes = goes_xrs.flux_to_flareclass(self.fluxes)
+
+    def time_flux_to_flareclass(self, n_flares):
+        goes_xrs.flux_to_flareclass(self.fluxes)
+
+    def time_flareclass_to_flux(self, n_flares):
+        goes_xrs.flareclass_to_flux(self.classes)
+
+    def peakmem_flux_to_flareclass(self, n_flares):
+        goes_xrs.flux_to_flareclass(self.fluxes)
+
+    def peakmem_flareclass_to_flux(self, n_flares):
+        goes_xrs.flareclass_to_flux(self.classes)
+
+    def track_round_trip_mismatches(self, n_flares):
+        # The flux is rounded to 3 significant figures in the flare class.
+        fluxes = goes_xrs.flareclass_to_flux(self.classes)
+        return int(np.sum(~np.isclose(fluxes, self.fluxes, rtol=5e-3, atol=0)))
+
+    track_round_trip_mismatches.unit = "flares"
+
+
+class IDLComparison:
+    """
+    The largest relative difference from the outputs of goes_chianti_tem.pro in SSWIDL
+    during the flares in the test files (see ``test_comparison_with_IDL_version``),
+    which should stay below 0.01.
+    """
+
+    params = [[15, 16], ["temperature", "emission_measure"]]
+    param_names = ["satellite_number", "quantity"]
+
+    def setup(self, satellite_number, quantity):
+        filename = {
+            15: "sci_gxrs-l2-irrad_g15_d20170910_v0-0-0_truncated.nc",
+            16: "sci_xrsf-l2-flx1s_g16_d20170910_v2-1-0_truncated.nc",
+        }[satellite_number]
+        goes_temp_em = goes_xrs.calculate_temperature_em(ts.TimeSeries(get_test_filepath(filename)))
+        idl_output = readsav(get_test_filepath(f"goes_{satellite_number}_test_chianti_tem_idl.sav"))
+        if quantity == "temperature":
+            self.expected = idl_output["temperature"][500:]
+            self.actual = goes_temp_em._data["temperature"].to_numpy()[500:]
+        else:
+            # The IDL emission measure is in units of 1e49 cm-3
+            self.expected = idl_output["emissions_measure"][500:]
+            self.actual = goes_temp_em._data["emission_measure"].to_numpy()[500:] / 1e49
+
+    def track_idl_relative_difference(self, satellite_number, quantity):
+        return float(np.nanmax(np.abs(self.actual / self.expected - 1)))
+
+    track_idl_relative_difference.unit = "relative difference"
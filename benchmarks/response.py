@@ -0,0 +1,203 @@
+"""
+Benchmarks for the temperature response calculations in `sunkit_instruments.response`.
+"""
+import numpy as np
+
+import astropy.units as u
+
+from sunpy.time import parse_time
+
+from sunkit_instruments.response import ResponseTable, SourceSpectra
+from sunkit_instruments.response.abstractions import AbstractChannel
+
+SPECTRA_UNIT = u.Unit("photon cm3 s-1 sr-1 Angstrom-1")
+
+
+class BenchmarkChannel(AbstractChannel):
+    """
+    A narrowband EUV channel with a Gaussian filter transmittance and
+    an exponential, wavelength-dependent degradation.
+    """
+
+    def __init__(self, center=171 * u.AA, n_wavelength=2000):
+        self.center = center
+        self._wavelength = np.linspace(center - 20 * u.AA, center + 20 * u.AA, n_wavelength)
+
+    @property
+    @u.quantity_input
+    def wavelength(self) -> u.Angstrom:
+        return self._wavelength
+
+    @u.quantity_input
+    def degradation(self, obstime=None) -> u.dimensionless_unscaled:
+        if obstime is None:
+            return 1.0
+        elapsed = (parse_time(obstime) - parse_time("2010-01-01")).to_value("yr")
+        return np.exp(-np.asarray(elapsed)[..., np.newaxis] * self.wavelength.to_value("AA") / 1e4)
+
+    @property
+    @u.quantity_input
+    def geometrical_area(self) -> u.cm**2:
+        return 20 * u.cm**2
+
+    @property
+    @u.quantity_input
+    def mirror_reflectance(self) -> u.dimensionless_unscaled:
+        return 0.3 * np.ones(self.wavelength.shape)
+
+    @property
+    @u.quantity_input
+    def filter_transmittance(self) -> u.dimensionless_unscaled:
+        return np.exp(-(((self.wavelength - self.center) / (2 * u.AA)) ** 2).decompose())
+
+    @property
+    @u.quantity_input
+    def effective_quantum_efficiency(self) -> u.dimensionless_unscaled:
+        return 0.8 * np.ones(self.wavelength.shape)
+
+    @property
+    @u.quantity_input
+    def camera_gain(self) -> u.DN / u.electron:
+        return 2 * u.DN / u.electron
+
+    @property
+    @u.quantity_input
+    def energy_per_electron(self) -> u.eV / u.electron:
+        return 3.65 * u.eV / u.electron
+
+    @property
+    @u.quantity_input
+    def pixel_solid_angle(self) -> u.steradian / u.pixel:
+        return (0.6 * u.arcsec) ** 2 / u.pixel
+
+
+def make_spectra(n_temperature, n_wavelength, **kwargs):
+    temperature = np.logspace(5, 8, n_temperature) * u.K
+    wavelength = np.linspace(1, 400, n_wavelength) * u.AA
+    rng = np.random.default_rng(1234)
+    data = rng.random(temperature.shape + wavelength.shape) * SPECTRA_UNIT
+    return SourceSpectra(temperature, wavelength, data, meta={"abundance_model": "benchmark"}, **kwargs)
+
+
+def make_channels():
+    return [BenchmarkChannel(center=center * u.AA) for center in [94, 131, 171, 195, 284, 304]]
+
+
+class SourceSpectraConstruction:
+    params = [[1_000, 10_000, 100_000]]
+    param_names = ["n_wavelength"]
+
+    def setup(self, n_wavelength):
+        self.temperature = np.logspace(5, 8, 101) * u.K
+        self.wavelength = np.linspace(1, 400, n_wavelength) * u.AA
+        self.data = np.random.default_rng(1234).random((101, n_wavelength)) * SPECTRA_UNIT
+
+    def time_construction(self, n_wavelength):
+        SourceSpectra(self.temperature, self.wavelength, self.data)
+
+    def peakmem_construction(self, n_wavelength):
+        SourceSpectra(self.temperature, self.wavelength, self.data)
+
+
+class TemperatureResponse:
+    params = [[1_000, 10_000, 100_000]]
+    param_names = ["n_wavelength"]
+
+    def setup(self, n_wavelength):
+        self.spectra = make_spectra(101, n_wavelength)
+        self.channels = make_channels()
+        self.obstime = parse_time("2015-01-01") + np.linspace(0, 10, 1000) * u.yr
+        # Compute once such that the cached quadrature weights are used
+        self.spectra.temperature_responses(self.channels)
+
+    def time_temperature_response(self, n_wavelength):
+        self.spectra.temperature_response(self.channels[0])
+
+    def time_temperature_response_uncached(self, n_wavelength):
+        self.spectra._weights_cache.clear()
+        self.spectra.temperature_response(self.channels[0])
+
+    def time_temperature_response_threshold(self, n_wavelength):
+        self.spectra.temperature_response(self.channels[0], threshold=1e-3)
+
+    def time_temperature_responses(self, n_wavelength):
+        self.spectra.temperature_responses(self.channels)
+
+    def time_temperature_response_time_series(self, n_wavelength):
+        self.spectra.temperature_response(self.channels[0], obstime=self.obstime)
+
+    def peakmem_temperature_responses(self, n_wavelength):
+        self.spectra.temperature_responses(self.channels)
+
+
+class TemperatureResponseChunked:
+    params = [[1_000, 10_000]]
+    param_names = ["chunk_size"]
+
+    def setup(self, chunk_size):
+        self.spectra = make_spectra(101, 100_000, chunks={"wavelength": chunk_size})
+        self.channels = make_channels()
+
+    def time_temperature_responses(self, chunk_size):
+        self.spectra.temperature_responses(self.channels)
+
+    def peakmem_temperature_responses(self, chunk_size):
+        self.spectra.temperature_responses(self.channels)
+
+
+class WavelengthResponse:
+    params = [[100, 10_000]]
+    param_names = ["n_wavelength"]
+
+    def setup(self, n_wavelength):
+        self.channel = BenchmarkChannel(n_wavelength=n_wavelength)
+        self.obstime = parse_time("2015-01-01") + np.linspace(0, 10, 1000) * u.yr
+
+    def time_wavelength_response(self, n_wavelength):
+        self.channel.wavelength_response()
+
+    def time_wavelength_response_uncached(self, n_wavelength):
+        self.channel.clear_cache()
+        self.channel.wavelength_response()
+
+    def time_wavelength_response_array_obstime(self, n_wavelength):
+        self.channel.wavelength_response(obstime=self.obstime)
+
+
+class Serialization:
+    params = [[10_000, 100_000]]
+    param_names = ["n_wavelength"]
+
+    def setup(self, n_wavelength):
+        import tempfile
+        from pathlib import Path
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = Path(self.tmpdir.name) / "spectra.nc"
+        self.spectra = make_spectra(101, n_wavelength)
+        self.spectra.save(self.filename)
+        self.channels = make_channels()
+        self.table_filename = Path(self.tmpdir.name) / "table.nc"
+        self.table = ResponseTable.from_spectra(self.spectra, self.channels)
+        self.table.save(self.table_filename)
+
+    def teardown(self, n_wavelength):
+        self.tmpdir.cleanup()
+
+    def time_save(self, n_wavelength):
+        self.spectra.save(self.filename.with_name("spectra_save.nc"))
+
+    def time_load(self, n_wavelength):
+        SourceSpectra.load(self.filename)
+
+    def time_load_temperature_responses(self, n_wavelength):
+        SourceSpectra.load(self.filename).temperature_responses(self.channels)
+
+    def peakmem_load_temperature_responses(self, n_wavelength):
+        SourceSpectra.load(self.filename).temperature_responses(self.channels)
+
+    def time_table_load(self, n_wavelength):
+        ResponseTable.load(self.table_filename)
+
+    def time_table_regrid(self, n_wavelength):
+        self.table.regrid(np.logspace(5.5, 7.5, 201) * u.K)
@@ -1,2 +1,4 @@
+from .flare_catalog import *  # NOQA
+from .flare_detection import *  # NOQA
 from .goes_chianti_tem import *  # NOQA
 from .goes_xrs import *  # NOQA
@@ -0,0 +1,259 @@
+"""
+A local catalog of GOES flares which caches the results of HEK queries.
+"""
+import sqlite3
+import contextlib
+from pathlib import Path
+
+import numpy as np
+
+from astropy import units as u
+from astropy.table import QTable
+from astropy.time import Time
+
+from sunpy.time import TimeRange
+
+from sunkit_instruments.goes_xrs.goes_xrs import _hek_event_table, _parse_times, flareclass_to_flux
+
+__all__ = ["GOESFlareCatalog"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS windows (
+    window_start TEXT NOT NULL,
+    window_end TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    start_time TEXT NOT NULL,
+    peak_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    goes_class TEXT NOT NULL,
+    goes_flux REAL,
+    longitude REAL,
+    latitude REAL,
+    noaa_active_region INTEGER
+);
+CREATE INDEX IF NOT EXISTS events_start_time ON events (start_time);
+CREATE INDEX IF NOT EXISTS events_end_time ON events (end_time);
+CREATE INDEX IF NOT EXISTS events_goes_flux ON events (goes_flux);
+"""
+
+_EVENT_COLUMNS = [
+    "event_id",
+    "start_time",
+    "peak_time",
+    "end_time",
+    "goes_class",
+    "goes_flux",
+    "longitude",
+    "latitude",
+    "noaa_active_region",
+]
+
+
+class GOESFlareCatalog:
+    """
+    A local catalog of the GOES flares in the HEK.
+
+    The catalog is stored in a SQLite database on disk. The first time a time range is
+    queried, all the GOES flares in that range are retrieved from the HEK and stored
+    in the catalog, along with the time range that was retrieved. Any later query is
+    answered from the catalog, and only the parts of the time range which are not
+    already in the catalog are retrieved from the HEK. Filtering by GOES class is done
+    locally, so does not require another HEK query.
+
+    Parameters
+    ----------
+    path : path-like
+        The SQLite database file. This is created if it does not exist.
+    client : optional
+        The client used to query the HEK. This must have a ``search`` method which
+        accepts the same attributes as `sunpy.net.hek.HEKClient.search`, and returns
+        an iterable of events with the same fields as the HEK. This can be used to
+        substitute a local stand-in for the HEK. Defaults to `~sunpy.net.hek.HEKClient`.
+
+    Examples
+    --------
+    >>> from sunpy.time import TimeRange
+    >>> from sunkit_instruments.goes_xrs import GOESFlareCatalog
+    >>> catalog = GOESFlareCatalog("goes_flares.sqlite")  # doctest: +SKIP
+    >>> flares = catalog.query(TimeRange("2011-06-07", "2011-06-08"), goes_class_filter="M1")  # doctest: +SKIP
+    """
+
+    def __init__(self, path, client=None):
+        self.path = Path(path)
+        self._client = client
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    @property
+    def client(self):
+        """
+        The client used to query the HEK.
+        """
+        if self._client is None:
+            # Importing hek here to avoid calling code that relies on optional dependencies.
+            from sunpy.net import hek
+
+            self._client = hek.HEKClient()
+        return self._client
+
+    def query(self, timerange, goes_class_filter=None):
+        """
+        Retrieve the GOES flares within a given time range.
+
+        Any parts of the time range which are not already in the catalog are first
+        retrieved from the HEK.
+
+        Parameters
+        ----------
+        timerange : `sunpy.time.TimeRange`
+            The time range to find flares in. This includes all the flares which
+            overlap with the time range.
+        goes_class_filter: `str`, optional
+            A string specifying a minimum GOES class for inclusion in the list,
+            e.g., "M1", "X2". Flares with a class of at least this, i.e. with a flux
+            greater than or equal to the flux of this class, are included, as for
+            `~sunkit_instruments.goes_xrs.get_goes_event_list`.
+
+        Returns
+        -------
+        `~astropy.table.QTable`
+            The flares, ordered by start time. This has the columns ``event_date``,
+            ``start_time``, ``peak_time``, ``end_time``, ``goes_class``, ``goes_flux``,
+            ``goes_location`` (the Stonyhurst heliographic longitude and latitude of the event),
+            ``noaa_active_region`` and ``event_id``. Missing values of ``noaa_active_region``
+            are masked, and missing locations are NaN.
+        """
+        timerange = TimeRange(timerange)
+        start, end = _isot(timerange.start), _isot(timerange.end)
+        with self._connect() as connection:
+            for window_start, window_end in self._missing_windows(connection, start, end):
+                self._retrieve(connection, window_start, window_end)
+            self._merge_windows(connection, start, end)
+
+            query = f"SELECT {', '.join(_EVENT_COLUMNS)} FROM events WHERE end_time >= ? AND start_time <= ?"
+            parameters = [start, end]
+            if goes_class_filter:
+                query += " AND goes_flux >= ?"
+                parameters.append(float(flareclass_to_flux(goes_class_filter).to_value("W/m^2")))
+            rows = connection.execute(query + " ORDER BY start_time", parameters).fetchall()
+        return _event_table(rows)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """
+        Connect to the database, committing any changes and closing the connection afterwards.
+        """
+        connection = sqlite3.connect(self.path)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _missing_windows(self, connection, start, end):
+        """
+        The parts of the time range between ``start`` and ``end`` which are not in the catalog.
+        """
+        windows = connection.execute(
+            "SELECT window_start, window_end FROM windows "
+            "WHERE window_end >= ? AND window_start <= ? ORDER BY window_start",
+            (start, end),
+        )
+        missing = []
+        covered_until = start
+        for window_start, window_end in windows:
+            if window_start > covered_until:
+                missing.append((covered_until, window_start))
+            covered_until = max(covered_until, window_end)
+        if covered_until < end:
+            missing.append((covered_until, end))
+        return missing
+
+    def _retrieve(self, connection, start, end):
+        """
+        Retrieve all the GOES flares between ``start`` and ``end`` from the HEK and add them to the catalog.
+        """
+        from sunpy.net import attrs
+
+        result = self.client.search(
+            attrs.Time(start, end),
+            attrs.hek.EventType("FL"),
+            attrs.hek.OBS.Observatory == "GOES",
+        )
+        events = _hek_event_table(result)
+        rows = zip(
+            events["event_id"],
+            _isot(events["start_time"]),
+            _isot(events["peak_time"]),
+            _isot(events["end_time"]),
+            events["goes_class"],
+            events["goes_flux"].to_value("W/m^2"),
+            events["goes_location"][:, 0].to_value(u.deg),
+            events["goes_location"][:, 1].to_value(u.deg),
+            events["noaa_active_region"],
+        )
+        connection.executemany(
+            f"INSERT OR REPLACE INTO events ({', '.join(_EVENT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(_EVENT_COLUMNS))})",
+            [tuple(_to_python(value) for value in row) for row in rows],
+        )
+        connection.execute("INSERT INTO windows VALUES (?, ?)", (start, end))
+
+    def _merge_windows(self, connection, start, end):
+        """
+        Replace the windows overlapping the time range between ``start`` and ``end`` with a single window.
+        """
+        window_start, window_end = connection.execute(
+            "SELECT MIN(window_start), MAX(window_end) FROM windows WHERE window_end >= ? AND window_start <= ?",
+            (start, end),
+        ).fetchone()
+        connection.execute(
+            "DELETE FROM windows WHERE window_end >= ? AND window_start <= ?",
+            (start, end),
+        )
+        connection.execute("INSERT INTO windows VALUES (?, ?)", (window_start, window_end))
+
+
+def _isot(time):
+    """
+    Times as ISO 8601 strings, such that they can be compared as strings in the database.
+    """
+    return Time(time, scale="utc", precision=3).isot
+
+
+def _to_python(value):
+    """
+    Convert NumPy scalars to Python types for the database, with missing values as NULL.
+    """
+    if value is np.ma.masked:
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _event_table(rows):
+    """
+    Table of the events retrieved from the database.
+    """
+    columns = dict(zip(_EVENT_COLUMNS, zip(*rows))) if rows else {name: () for name in _EVENT_COLUMNS}
+    table = QTable()
+    for name in ["start_time", "peak_time", "end_time"]:
+        table[name] = _parse_times(list(columns[name]))
+    table.add_column(np.asarray(table["start_time"].strftime("%Y-%m-%d"), dtype=str), name="event_date", index=0)
+    table["goes_class"] = np.array(columns["goes_class"], dtype=str)
+    table["goes_flux"] = u.Quantity(np.array(columns["goes_flux"], dtype=float), "W/m^2")
+    table["goes_location"] = u.Quantity(
+        np.stack(
+            [np.array(columns["longitude"], dtype=float), np.array(columns["latitude"], dtype=float)],
+            axis=-1,
+        ),
+        u.deg,
+    )
+    noaa_active_region = columns["noaa_active_region"]
+    missing = np.array([value is None for value in noaa_active_region], dtype=bool)
+    table["noaa_active_region"] = np.ma.array(
+        [0 if value is None else value for value in noaa_active_region], mask=missing, dtype=np.int64
+    )
+    table["event_id"] = np.array(columns["event_id"], dtype=str)
+    return table
@@ -0,0 +1,235 @@
+"""
+Detection of flares in GOES/XRS observations.
+"""
+import numpy as np
+import pandas as pd
+
+from astropy import units as u
+from astropy.table import QTable
+from astropy.time import Time
+
+from sunkit_instruments.goes_xrs.goes_xrs import flux_to_flareclass
+
+__all__ = ["detect_flares", "FlareDetector"]
+
+# The number of minutes of increasing flux needed for the start of a flare
+_RISE_LENGTH = 4
+# The increase in flux over the rise needed for the start of a flare
+_RISE_FACTOR = 1.4
+
+
+@u.quantity_input
+def detect_flares(times, xrsb: u.W / u.m**2, background_window: u.min = 30 * u.min):
+    """
+    Detect flares in the GOES/XRS long channel (1-8 Angstrom) flux.
+
+    The flux is averaged into 1 minute bins, and the flares are found using the
+    NOAA rules for the 1 minute data:
+
+    * The start is the first minute of four minutes in which the flux increases
+      every minute, and for which the flux in the last minute is at least 1.4 times
+      the flux in the first minute.
+    * The end is the first minute after the start in which the flux has decayed to
+      halfway between the peak flux and the pre-flare background.
+    * The peak is the minute with the maximum flux between the start and the end.
+
+    The pre-flare background is the minimum flux in the ``background_window`` up to
+    the start of the flare. A new flare can only start after the end of the previous flare.
+
+    Parameters
+    ----------
+    times : `~astropy.time.Time` or array-like of `numpy.datetime64`
+        The times of the observations.
+    xrsb : `~astropy.units.Quantity`
+        The flux in the long (1-8 Angstrom) channel. Any bad data should be set to NaN.
+    background_window : `~astropy.units.Quantity`, optional
+        The length of time before the start of a flare used to find the pre-flare background.
+        Default is 30 minutes.
+
+    Returns
+    -------
+    `~astropy.table.QTable`
+        The flares, with the columns ``start_time``, ``peak_time``, ``end_time``,
+        ``goes_class``, ``goes_flux`` (the peak flux) and ``background_flux``.
+        Flares which have not ended by the end of the observations are not included.
+
+    See Also
+    --------
+    FlareDetector
+
+    Examples
+    --------
+    >>> from sunpy import timeseries as ts
+    >>> from sunkit_instruments import goes_xrs
+    >>> goes_ts = ts.TimeSeries("sci_xrsf-l2-flx1s_g16_d20170910_v2-1-0.nc")  # doctest: +SKIP
+    >>> flares = goes_xrs.detect_flares(goes_ts.time, goes_ts.quantity("xrsb"))  # doctest: +SKIP
+    """
+    flux = _minute_flux(times, xrsb)
+    background = _background_flux(flux, background_window)
+    flares, _ = _detect_flares(flux, background)
+    return _flare_table(flux, background, flares)
+
+
+class FlareDetector:
+    """
+    Detect flares in a live stream of GOES/XRS long channel (1-8 Angstrom) flux.
+
+    This applies the same rules as `detect_flares`, but the observations are passed
+    to `update` as they arrive. Each flare is returned by `update` once it has ended.
+    Only the observations which are still needed to detect flares are kept, i.e.
+    those since the start of the current flare, or the last few minutes if there is
+    no current flare, along with the ``background_window`` before these.
+
+    Parameters
+    ----------
+    background_window : `~astropy.units.Quantity`, optional
+        The length of time before the start of a flare used to find the pre-flare background.
+        Default is 30 minutes.
+
+    Examples
+    --------
+    >>> from sunkit_instruments import goes_xrs
+    >>> detector = goes_xrs.FlareDetector()
+    >>> for times, xrsb in stream:  # doctest: +SKIP
+    ...     for flare in detector.update(times, xrsb):  # doctest: +SKIP
+    ...         print(flare["goes_class"], flare["peak_time"])  # doctest: +SKIP
+    """
+
+    @u.quantity_input
+    def __init__(self, background_window: u.min = 30 * u.min):
+        self.background_window = background_window
+        self._buffer = pd.Series(dtype=float, index=pd.DatetimeIndex([], dtype="datetime64[ns]"))
+        self._last_end = None
+
+    @u.quantity_input
+    def update(self, times, xrsb: u.W / u.m**2):
+        """
+        Add new observations, and return any flares which have ended.
+
+        Parameters
+        ----------
+        times : `~astropy.time.Time` or array-like of `numpy.datetime64`
+            The times of the new observations. These must be later than those of
+            the previous observations.
+        xrsb : `~astropy.units.Quantity`
+            The flux in the long (1-8 Angstrom) channel.
+
+        Returns
+        -------
+        `~astropy.table.QTable`
+            The flares which have ended, in the same format as `detect_flares`.
+        """
+        new = pd.Series(xrsb.to_value(u.W / u.m**2), index=_datetime_index(times))
+        self._buffer = pd.concat([self._buffer, new]) if len(self._buffer) else new
+        flux = _minute_flux(self._buffer.index, self._buffer.to_numpy() * u.W / u.m**2)
+        # The last minute may not be complete, so is only used once there are later observations.
+        flux = flux.iloc[:-1]
+        background = _background_flux(flux, self.background_window)
+        first_start = 0 if self._last_end is None else flux.index.searchsorted(self._last_end, side="right")
+        flares, current_start = _detect_flares(flux, background, first_start=first_start)
+        if flares:
+            self._last_end = flux.index[flares[-1][2]]
+
+        # Keep the observations needed for the current flare, or for one that may start
+        # in the last few minutes, along with the background before them.
+        if current_start is None:
+            keep_from = max(len(flux) - _RISE_LENGTH + 1, 0)
+        else:
+            keep_from = current_start
+        if len(flux):
+            keep_from = flux.index[min(keep_from, len(flux) - 1)] - pd.Timedelta(
+                self.background_window.to_value(u.s), "s"
+            )
+            self._buffer = self._buffer[self._buffer.index >= keep_from]
+        return _flare_table(flux, background, flares)
+
+
+def _datetime_index(times):
+    """
+    The times as a `pandas.DatetimeIndex`.
+    """
+    if isinstance(times, Time):
+        times = times.datetime64
+    return pd.DatetimeIndex(np.asarray(times, dtype="datetime64[ns]"))
+
+
+def _minute_flux(times, xrsb):
+    """
+    The flux averaged in 1 minute bins.
+    """
+    flux = pd.Series(xrsb.to_value(u.W / u.m**2), index=_datetime_index(times))
+    return flux.resample("1min").mean()
+
+
+def _background_flux(flux, background_window):
+    """
+    The minimum flux in the window up to each minute.
+    """
+    return flux.rolling(pd.Timedelta(background_window.to_value(u.s), "s")).min().to_numpy()
+
+
+def _detect_flares(flux, background, first_start=0):
+    """
+    Find the start, peak and end index of each flare in the 1 minute flux.
+
+    The candidate starts are found for all minutes at once. Each flare is then
+    followed from its start to its end, and candidate starts before the end are
+    skipped. Also returns the start of a flare which has not yet ended, or `None`.
+    """
+    f = flux.to_numpy()
+    increasing = f[1:] > f[:-1]
+    is_start = np.ones(max(f.size - _RISE_LENGTH + 1, 0), dtype=bool)
+    for i in range(_RISE_LENGTH - 1):
+        is_start &= increasing[i : i + is_start.size]
+    is_start &= f[_RISE_LENGTH - 1 :] >= _RISE_FACTOR * f[: is_start.size]
+    is_start[:first_start] = False
+
+    flares = []
+    next_start = 0
+    for start in np.flatnonzero(is_start):
+        if start < next_start:
+            continue
+        end = _find_end(f, start, background[start])
+        if end is None:
+            return flares, start
+        peak = start + np.nanargmax(f[start : end + 1])
+        flares.append((start, peak, end))
+        next_start = end + 1
+    return flares, None
+
+
+def _find_end(f, start, background):
+    """
+    Find the first minute after the rise in which the flux has decayed to halfway between the peak flux and the background.
+
+    The flux is searched in increasingly long segments, such that the time taken
+    depends on the length of the flare rather than the length of the observations.
+    """
+    length = 4 * 60
+    while True:
+        segment = f[start : start + length]
+        peak_flux = np.fmax.accumulate(segment)
+        ended = segment <= (peak_flux + background) / 2
+        ended[:_RISE_LENGTH] = False
+        if ended.any():
+            return start + np.argmax(ended)
+        if start + length >= f.size:
+            return None
+        length *= 2
+
+
+def _flare_table(flux, background, flares):
+    """
+    Table of the flares found in the 1 minute flux.
+    """
+    start, peak, end = np.array(flares, dtype=int).reshape(-1, 3).T
+    times = flux.index.to_numpy()
+    values = flux.to_numpy()
+    table = QTable()
+    for name, index in [("start_time", start), ("peak_time", peak), ("end_time", end)]:
+        table[name] = Time(times[index], format="datetime64", scale="utc")
+        table[name].format = "isot"
+    table["goes_flux"] = values[peak] * u.W / u.m**2
+    table["goes_class"] = np.asarray(flux_to_flareclass(table["goes_flux"]), dtype=str)
+    table["background_flux"] = background[start] * u.W / u.m**2
+    return table
@@ -1,3 +1,9 @@
+import time
+import functools
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import h5py
 import numpy as np
 import pandas as pd
 from scipy import interpolate
@@ -11,12 +17,32 @@ from sunpy.data import manager
 from sunpy.time import parse_time
 from sunpy.util.exceptions import warn_user
 
-__all__ = ["calculate_temperature_em"]
+__all__ = [
+    "TemperatureEMUpdater",
+    "calculate_temperature_em",
+    "calculate_temperature_em_batch",
+    "calculate_temperature_em_from_flux",
+    "calculate_temperature_em_merged",
+    "stream_temperature_em",
+]
 
 MAX_SUPPORTED_SATELLITE = 19
+# The maximum relative deviation of the fast lookup tables from the response splines
+LOOKUP_RTOL = 1e-6
+# The maximum number of grid points in a fast lookup table
+_MAX_LOOKUP_SIZE = 2**22
 
 
-def calculate_temperature_em(goes_ts, abundance="coronal"):
+@u.quantity_input
+def calculate_temperature_em(
+    goes_ts,
+    abundance="coronal",
+    xrsa_uncertainty: u.W / u.m**2 = None,
+    xrsb_uncertainty: u.W / u.m**2 = None,
+    fast=False,
+    background_window: u.s = None,
+    background_percentile=0,
+):
     """
     This function calculates the isothermal temperature and
     corresponding volume emission measure of the solar soft X-ray
@@ -44,11 +70,32 @@ def calculate_temperature_em(goes_ts, abundance="coronal"):
     abundance: str, optional
         Which abundances to use for the calculation, the default is "coronal".
         Can be either "coronal" or "photospheric".
+    xrsa_uncertainty, xrsb_uncertainty : `~astropy.units.Quantity`, optional
+        The uncertainty of the flux in each channel, either for all times or for each time.
+        If either is given, the uncertainties are propagated to the temperature and emission
+        measure using the analytic derivatives of the response splines (see notes).
+        A missing uncertainty is taken to be zero.
+    fast : `bool`, optional
+        If `True`, the response is evaluated using dense lookup tables rather than splines,
+        which is faster for large numbers of samples. The temperature and emission measure
+        then differ from those calculated with the splines by a relative amount of less
+        than ``LOOKUP_RTOL`` (1e-6). If a lookup table cannot meet this tolerance, a warning
+        is emitted and the splines are used instead. Default is `False`.
+    background_window : `~astropy.units.Quantity`, optional
+        If specified, a background is subtracted from the flux in each channel before the
+        flux ratio is calculated. The background at each time is the ``background_percentile``
+        of the good flux within this length of time up to and including that time (see notes).
+        Default is `None`, for which no background is subtracted.
+    background_percentile : `float`, optional
+        The percentile (between 0 and 100) of the flux in the ``background_window`` used as the
+        background. Default is 0, i.e. the minimum flux.
 
     Returns
     -------
     `~sunpy.timeseries.GenericTimeSeries`
         Contains the temperature and emission measure calculated from the input ``goes_ts`` time series.
+        If a flux uncertainty is given, this also contains the ``temperature_uncertainty`` and
+        ``emission_measure_uncertainty`` columns.
 
     Example
     -------
@@ -66,6 +113,21 @@ def calculate_temperature_em(goes_ts, abundance="coronal"):
     The routine determines from the `sunpy.timeseries.sources.XRSTimeSeries` metadata
     whether the SWPC scaling factors need to be removed (which are present in the FITS data).
 
+    The uncertainties are propagated to first order, assuming that the uncertainties of the
+    two channels are independent. This is equivalent to, but much faster than, perturbing
+    the fluxes by their uncertainties many times and recalculating the temperature and
+    emission measure, as long as the uncertainties are small compared to the fluxes.
+    Where the fluxes are too low for the flux ratio to be used, the temperature
+    uncertainty is zero.
+
+    The background is calculated for all times at once with the rolling window methods of
+    `pandas`, for which the rolling minimum takes a time proportional to the number of samples,
+    independent of the length of the window, so can be used on long, multi-day timeseries.
+    Where the background-subtracted flux is below the thresholds for good data,
+    e.g. outside of flares when the background is the rolling minimum,
+    the temperature is that of the fixed flux ratio used for low fluxes.
+    Any uncertainty of the background is not included in the propagated uncertainties.
+
     See also: https://hesperia.gsfc.nasa.gov/goes/goes.html#Temperature/Emission%20Measure
 
     In regards to the re-processed GOES 8-15 data, please refer to the documentation here:
@@ -82,6 +144,167 @@ def calculate_temperature_em(goes_ts, abundance="coronal"):
     .. [1] White, S. M., Thomas, R. J., & Schwartz, R. A. 2005,
         Sol. Phys., 227, 231, DOI: 10.1007/s11207-005-2445-z
     """
+    satellite_number = _get_satellite_number(goes_ts)
+    _check_satellite_and_abundance(satellite_number, abundance)
+    # Check if GOES-R and whether the primary detector values are given
+    if satellite_number >= 16:
+        if "xrsa_primary_chan" in goes_ts.columns:
+            output = _manage_goesr_detectors(
+                goes_ts,
+                satellite_number,
+                abundance=abundance,
+                xrsa_uncertainty=xrsa_uncertainty,
+                xrsb_uncertainty=xrsb_uncertainty,
+                fast=fast,
+                background_window=background_window,
+                background_percentile=background_percentile,
+            )
+        else:
+            warn_user(
+                "No information about primary/secondary detectors in XRSTimeSeries, assuming primary for all"
+            )
+            output = _chianti_temp_emiss(
+                goes_ts,
+                satellite_number,
+                abundance=abundance,
+                xrsa_uncertainty=xrsa_uncertainty,
+                xrsb_uncertainty=xrsb_uncertainty,
+                fast=fast,
+                background_window=background_window,
+                background_percentile=background_percentile,
+            )
+
+    else:
+        output = _chianti_temp_emiss(
+            goes_ts,
+            satellite_number,
+            abundance=abundance,
+            remove_scaling=_has_swpc_scaling(goes_ts),
+            xrsa_uncertainty=xrsa_uncertainty,
+            xrsb_uncertainty=xrsb_uncertainty,
+            fast=fast,
+            background_window=background_window,
+            background_percentile=background_percentile,
+        )
+
+    return output
+
+
+@u.quantity_input
+def calculate_temperature_em_from_flux(
+    xrsa: u.W / u.m**2,
+    xrsb: u.W / u.m**2,
+    satellite_number,
+    date,
+    abundance="coronal",
+    xrsa_quality=None,
+    xrsb_quality=None,
+    xrsa_primary_chan=None,
+    xrsb_primary_chan=None,
+    remove_scaling=False,
+    xrsa_uncertainty: u.W / u.m**2 = None,
+    xrsb_uncertainty: u.W / u.m**2 = None,
+    fast=False,
+):
+    """
+    Calculate the isothermal temperature and volume emission measure from arrays of GOES/XRS fluxes.
+
+    This is the same calculation as `calculate_temperature_em`, but operates directly on
+    arrays of the flux and quality flags rather than on a `~sunpy.timeseries.sources.XRSTimeSeries`.
+    This avoids the overhead of constructing timeseries and dataframes in pipelines which
+    already have the XRS data as arrays.
+
+    Parameters
+    ----------
+    xrsa : `~astropy.units.Quantity`
+        The flux in the short (0.5-4 Angstrom) channel.
+    xrsb : `~astropy.units.Quantity`
+        The flux in the long (1-8 Angstrom) channel.
+    satellite_number : `int`
+        GOES satellite number.
+    date : any format parsed by `sunpy.time.parse_time`
+        Date of the observations. This is needed to apply the correct scaling for GOES-6.
+    abundance: str, optional
+        Which abundances to use for the calculation, the default is "coronal".
+        Can be either "coronal" or "photospheric".
+    xrsa_quality, xrsb_quality : array-like, optional
+        Quality flags for each channel. Times where either flag is nonzero are set to NaN.
+    xrsa_primary_chan, xrsb_primary_chan : array-like, optional
+        The primary detector (1 or 2) used at each time for each channel for GOES-R.
+        If not given, the primary detectors are assumed for all times.
+    remove_scaling: `bool`, optional
+        Whether to remove the SWPC scaling factors. This is only needed for the
+        older FITS files for GOES 8-15 XRS. Default is `False`.
+    xrsa_uncertainty, xrsb_uncertainty : `~astropy.units.Quantity`, optional
+        The uncertainty of the flux in each channel. If either is given, the
+        uncertainties of the temperature and emission measure are also returned.
+        A missing uncertainty is taken to be zero.
+    fast : `bool`, optional
+        If `True`, the response is evaluated using dense lookup tables rather than splines,
+        which is faster for large numbers of samples. The temperature and emission measure
+        then differ from those calculated with the splines by a relative amount of less
+        than ``LOOKUP_RTOL`` (1e-6). If a lookup table cannot meet this tolerance, a warning
+        is emitted and the splines are used instead. Default is `False`.
+
+    Returns
+    -------
+    temperature : `~astropy.units.Quantity`
+        The temperature.
+    emission_measure : `~astropy.units.Quantity`
+        The volume emission measure.
+    temperature_uncertainty : `~astropy.units.Quantity`
+        The uncertainty of the temperature. Only returned if a flux uncertainty is given.
+    emission_measure_uncertainty : `~astropy.units.Quantity`
+        The uncertainty of the volume emission measure. Only returned if a flux uncertainty is given.
+
+    See Also
+    --------
+    calculate_temperature_em
+
+    Example
+    -------
+    >>> import astropy.units as u
+    >>> from sunkit_instruments import goes_xrs
+    >>> xrsa = [1e-7, 2e-6] * u.W / u.m**2
+    >>> xrsb = [1e-6, 1e-5] * u.W / u.m**2
+    >>> temperature, emission_measure = goes_xrs.calculate_temperature_em_from_flux(
+    ...     xrsa, xrsb, 16, "2017-09-10"
+    ... )  # doctest: +REMOTE_DATA
+    """
+    _check_satellite_and_abundance(satellite_number, abundance)
+    secondary = 0
+    if satellite_number >= 16 and xrsa_primary_chan is not None and xrsb_primary_chan is not None:
+        secondary = _goesr_detector_index(xrsa_primary_chan, xrsb_primary_chan)
+    result = _temperature_emission_measure(
+        xrsa.to_value(u.W / u.m**2),
+        xrsb.to_value(u.W / u.m**2),
+        satellite_number,
+        parse_time(date),
+        secondary=secondary,
+        abundance=abundance,
+        remove_scaling=remove_scaling,
+        shortflux_quality=xrsa_quality,
+        longflux_quality=xrsb_quality,
+        shortflux_uncertainty=_flux_value(xrsa_uncertainty),
+        longflux_uncertainty=_flux_value(xrsb_uncertainty),
+        fast=fast,
+    )
+    units = [u.MK, u.cm ** (-3)] * 2
+    scales = [1, 1e49] * 2
+    return tuple(u.Quantity(value * scale, unit) for value, scale, unit in zip(result, scales, units))
+
+
+def _flux_value(flux):
+    """
+    The value of an optional flux in W/m**2.
+    """
+    return None if flux is None else flux.to_value(u.W / u.m**2)
+
+
+def _get_satellite_number(goes_ts):
+    """
+    The GOES satellite number of a XRS timeseries.
+    """
     if not isinstance(goes_ts, ts.XRSTimeSeries):
         raise TypeError(
             f"Input time series must be a XRSTimeSeries instance, not {type(goes_ts)}"
@@ -92,7 +315,23 @@ def calculate_temperature_em(goes_ts, abundance="coronal"):
             "The GOES satellite number was not found in the input time series"
         )
 
-    satellite_number = int(goes_ts.observatory.split("-")[-1])
+    return int(goes_ts.observatory.split("-")[-1])
+
+
+def _has_swpc_scaling(goes_ts):
+    """
+    Whether the SWPC scaling factors need to be removed from a XRS timeseries.
+
+    The older FITS files need the scaling factor to be removed.
+    The newer netcdf files now return "true" fluxes so this SWPC factor doesn't need to be removed.
+    """
+    return goes_ts.meta.metas[0].get("Origin") == "SDAC/GSFC"
+
+
+def _check_satellite_and_abundance(satellite_number, abundance):
+    """
+    Check that the satellite number and abundance are supported.
+    """
     if (satellite_number < 1) or (satellite_number > MAX_SUPPORTED_SATELLITE):
         raise ValueError(
             f"GOES satellite number has to be between 1 and {MAX_SUPPORTED_SATELLITE}, {satellite_number} was found."
@@ -103,46 +342,488 @@ def calculate_temperature_em(goes_ts, abundance="coronal"):
         raise ValueError(
             f"The abundance can only be `coronal` or `photospheric`, not {abundance}."
         )
-    # Check if GOES-R and whether the primary detector values are given
-    if satellite_number >= 16:
-        if "xrsa_primary_chan" in goes_ts.columns:
-            output = _manage_goesr_detectors(
-                goes_ts, satellite_number, abundance=abundance
+
+
+def stream_temperature_em(goes_sources, abundance="coronal", output=None, fast=False):
+    """
+    Calculate the temperature and emission measure for a sequence of GOES/XRS files or timeseries.
+
+    Each file or timeseries is loaded and processed one at a time, such that memory use is
+    bounded by the size of a single chunk rather than the whole record. This is useful for
+    processing many years of GOES/XRS data. The GOES CHIANTI response table is only read once
+    and is reused for every chunk.
+
+    Parameters
+    ----------
+    goes_sources : iterable
+        An iterable of GOES/XRS files or `~sunpy.timeseries.sources.XRSTimeSeries`.
+        This can be a generator, e.g. one that reads a long record in chunks.
+    abundance: str, optional
+        Which abundances to use for the calculation, the default is "coronal".
+        Can be either "coronal" or "photospheric".
+    output : path-like, optional
+        If specified, the results are also appended to this HDF5 file as they are computed.
+        The file contains the one-dimensional datasets ``time`` (in nanoseconds since
+        1970-01-01 UTC), ``temperature`` and ``emission_measure``, the units of which
+        are stored in the ``unit`` attribute of each dataset. If the file already exists,
+        the results are appended to the existing datasets.
+    fast : `bool`, optional
+        Whether to evaluate the response using dense lookup tables (see `calculate_temperature_em`).
+
+    Yields
+    ------
+    `~sunpy.timeseries.GenericTimeSeries`
+        The temperature and emission measure for each file or timeseries.
+
+    See Also
+    --------
+    calculate_temperature_em
+
+    Example
+    -------
+    >>> from sunkit_instruments import goes_xrs
+    >>> files = ["sci_xrsf-l2-flx1s_g16_d20170910_v2-1-0.nc", "sci_xrsf-l2-flx1s_g16_d20170911_v2-1-0.nc"]  # doctest: +SKIP
+    >>> for temp_em in goes_xrs.stream_temperature_em(files, output="goes16_temp_em.h5"):  # doctest: +SKIP
+    ...     print(temp_em.quantity("temperature").max())  # doctest: +SKIP
+    """
+    for goes_ts in goes_sources:
+        if not isinstance(goes_ts, ts.GenericTimeSeries):
+            goes_ts = ts.TimeSeries(goes_ts)
+        temp_em = calculate_temperature_em(goes_ts, abundance=abundance, fast=fast)
+        if output is not None:
+            _append_temperature_em(output, temp_em)
+        yield temp_em
+
+
+def calculate_temperature_em_batch(files, abundance="coronal", output_dir=None, max_workers=None, fast=False):
+    """
+    Calculate the temperature and emission measure for many GOES/XRS files in parallel.
+
+    The files are processed with `calculate_temperature_em` in a pool of processes.
+    The GOES CHIANTI response table is downloaded, if needed, before the processes are
+    started, such that it is only downloaded once and any error in doing so is raised
+    immediately. Each process then reads the table from the cache once and reuses it for
+    every file handled by that process. A file that cannot be processed does not stop
+    the batch; instead, the error is reported for that file.
+
+    Parameters
+    ----------
+    files : iterable of path-like
+        The GOES/XRS files.
+    abundance: str, optional
+        Which abundances to use for the calculation, the default is "coronal".
+        Can be either "coronal" or "photospheric".
+    output_dir : path-like, optional
+        If specified, the results for each file are written to a HDF5 file in this
+        directory (see `stream_temperature_em` for the format), named after the input
+        file with the suffix ``_temp_em.h5``. In this case, the results are not returned,
+        which avoids transferring them between processes.
+    max_workers : `int`, optional
+        The maximum number of processes. Defaults to the number of processors.
+    fast : `bool`, optional
+        Whether to evaluate the response using dense lookup tables (see `calculate_temperature_em`).
+
+    Returns
+    -------
+    `list` of `dict`
+        One entry for each file, in the same order as ``files``, with the keys:
+
+        * ``file``: The input file.
+        * ``result``: The `~sunpy.timeseries.GenericTimeSeries` containing the temperature
+          and emission measure, or `None` if ``output_dir`` is specified or the file failed.
+        * ``output``: The path to the output file, or `None`.
+        * ``elapsed``: The time taken to process the file.
+        * ``error``: A description of the error if the file failed, otherwise `None`.
+
+    Notes
+    -----
+    As this uses `concurrent.futures.ProcessPoolExecutor`, on platforms where new processes
+    are spawned (e.g. Windows and macOS) this must be called from within an
+    ``if __name__ == "__main__":`` block when used in a script.
+
+    Example
+    -------
+    >>> from sunkit_instruments import goes_xrs
+    >>> files = ["sci_xrsf-l2-flx1s_g16_d20170910_v2-1-0.nc", "sci_xrsf-l2-flx1s_g16_d20170911_v2-1-0.nc"]  # doctest: +SKIP
+    >>> results = goes_xrs.calculate_temperature_em_batch(files, max_workers=2)  # doctest: +SKIP
+    >>> failed = [r["file"] for r in results if r["error"] is not None]  # doctest: +SKIP
+    """
+    files = list(files)
+    if output_dir is not None:
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+    _get_response_table()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                _process_goes_file,
+                files,
+                [abundance] * len(files),
+                [output_dir] * len(files),
+                [fast] * len(files),
             )
+        )
+
+
+def _process_goes_file(filename, abundance, output_dir, fast):
+    """
+    Calculate the temperature and emission measure for a single file, recording the time taken and any error.
+    """
+    start = time.perf_counter()
+    result = {"file": filename, "result": None, "output": None, "elapsed": None, "error": None}
+    try:
+        temp_em = calculate_temperature_em(ts.TimeSeries(filename), abundance=abundance, fast=fast)
+        if output_dir is None:
+            result["result"] = temp_em
         else:
-            warn_user(
-                "No information about primary/secondary detectors in XRSTimeSeries, assuming primary for all"
-            )
-            output = _chianti_temp_emiss(goes_ts, satellite_number, abundance=abundance)
+            result["output"] = output_dir / f"{Path(filename).stem}_temp_em.h5"
+            result["output"].unlink(missing_ok=True)
+            _append_temperature_em(result["output"], temp_em)
+    except Exception as e:  # NOQA: BLE001
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["elapsed"] = (time.perf_counter() - start) * u.s
+    return result
+
+
+@u.quantity_input
+def calculate_temperature_em_merged(goes_timeseries, abundance="coronal", cadence: u.s = None, fast=False):
+    """
+    Calculate a continuous temperature and emission measure record from several GOES/XRS satellites.
+
+    The timeseries from each satellite are averaged onto a common time grid. At each time,
+    the data from the first satellite (in the order given) with good data in both channels
+    is used, where data are good if the fluxes are finite, the quality flags are zero,
+    and for GOES-R, valid primary detectors are given. The per-satellite corrections
+    applied by `calculate_temperature_em` (the SWPC scaling factors for the older FITS files,
+    and the response table of the satellite and detectors used) are then applied to each
+    time, and the temperature and emission measure are calculated for all times at once.
 
-    # Check if the older files are passed, and if so then the scaling factor needs to be removed.
-    # The newer netcdf files now return "true" fluxes so this SWPC factor doesn't need to be removed.
+    Parameters
+    ----------
+    goes_timeseries : iterable of `~sunpy.timeseries.sources.XRSTimeSeries`
+        The GOES/XRS timeseries, in order of priority, e.g. the primary satellite followed
+        by the secondary satellite.
+    abundance: str, optional
+        Which abundances to use for the calculation, the default is "coronal".
+        Can be either "coronal" or "photospheric".
+    cadence : `~astropy.units.Quantity`, optional
+        The spacing of the common time grid. Defaults to the largest cadence of the timeseries,
+        which must then each have at least two samples.
+    fast : `bool`, optional
+        Whether to evaluate the response using dense lookup tables (see `calculate_temperature_em`).
+
+    Returns
+    -------
+    `~sunpy.timeseries.GenericTimeSeries`
+        Contains the temperature and emission measure on the common time grid, along
+        with the ``satellite`` column which gives the GOES satellite number used at each
+        time. Times without good data from any satellite have a satellite number of 0.
+
+    Notes
+    -----
+    When the data are averaged onto the common time grid, the GOES-R detectors used
+    for each time are those of the first good sample in each interval.
+
+    Example
+    -------
+    >>> from sunpy import timeseries as ts
+    >>> from sunkit_instruments import goes_xrs
+    >>> goes16 = ts.TimeSeries("sci_xrsf-l2-flx1s_g16_d20170910_v2-1-0.nc")  # doctest: +SKIP
+    >>> goes15 = ts.TimeSeries("sci_gxrs-l2-irrad_g15_d20170910_v0-0-0.nc")  # doctest: +SKIP
+    >>> goes_temp_em = goes_xrs.calculate_temperature_em_merged([goes16, goes15])  # doctest: +SKIP
+    """
+    goes_timeseries = list(goes_timeseries)
+    if not goes_timeseries:
+        raise ValueError("At least one GOES/XRS timeseries must be given.")
+    satellite_numbers = np.array([_get_satellite_number(goes_ts) for goes_ts in goes_timeseries])
+    for satellite_number in satellite_numbers:
+        _check_satellite_and_abundance(satellite_number, abundance)
+
+    if cadence is None:
+        if any(len(goes_ts._data.index) < 2 for goes_ts in goes_timeseries):
+            raise ValueError(
+                "The cadence must be given if any GOES/XRS timeseries has fewer than two samples."
+            )
+        frequency = max(pd.Timedelta(np.median(np.diff(goes_ts._data.index))) for goes_ts in goes_timeseries)
     else:
-        if ("Origin" in goes_ts.meta.metas[0]) and (
-            goes_ts.meta.metas[0].get("Origin") == "SDAC/GSFC"
-        ):
-            remove_scaling = True
+        frequency = pd.Timedelta(cadence.to_value(u.s), "s")
+    start = min(goes_ts._data.index[0] for goes_ts in goes_timeseries).floor(frequency)
+    end = max(goes_ts._data.index[-1] for goes_ts in goes_timeseries)
+    grid = pd.date_range(start, end, freq=frequency)
+
+    # Arrays of shape (satellite, time) on the common time grid
+    resampled = [_resample_xrs(goes_ts, grid, frequency) for goes_ts in goes_timeseries]
+    shortflux, longflux, secondary = (
+        np.stack([data[name].to_numpy(dtype=float) for data in resampled])
+        for name in ["xrsa", "xrsb", "secondary"]
+    )
+    good = np.isfinite(shortflux) & np.isfinite(longflux)
+    choice = np.argmax(good, axis=0)[np.newaxis]
+    has_good = good.any(axis=0)
+
+    shortflux, longflux, secondary = (
+        np.take_along_axis(values, choice, axis=0)[0] for values in [shortflux, longflux, secondary]
+    )
+    satellite = np.where(has_good, satellite_numbers[choice[0]], 0)
+    remove_scaling = np.array([_has_swpc_scaling(goes_ts) for goes_ts in goes_timeseries])[choice[0]]
+    temp, emission_measure = _temperature_emission_measure(
+        shortflux,
+        longflux,
+        satellite,
+        parse_time(grid[0]),
+        secondary=np.where(np.isfinite(secondary), secondary, -1).astype(int),
+        abundance=abundance,
+        remove_scaling=remove_scaling,
+        fast=fast,
+    )
+
+    df = pd.DataFrame(
+        {"temperature": temp, "emission_measure": emission_measure * 1e49, "satellite": satellite},
+        index=grid,
+    )
+    units = {"temperature": u.MK, "emission_measure": u.cm ** (-3), "satellite": u.dimensionless_unscaled}
+    header = {"Info": "Estimated temperature and emission measure from merged GOES/XRS observations"}
+    return ts.TimeSeries(df, header, units)
+
+
+def _resample_xrs(goes_ts, grid, frequency):
+    """
+    Average the good data in a XRS timeseries onto a time grid.
+
+    Also gives the index of the GOES-R detector combination of the first good sample
+    in each interval, or 0 for earlier satellites.
+    """
+    data = goes_ts.to_dataframe()
+    shortflux = goes_ts.quantity("xrsa").to_value(u.W / u.m**2)
+    longflux = goes_ts.quantity("xrsb").to_value(u.W / u.m**2)
+    good = np.isfinite(shortflux) & np.isfinite(longflux)
+    if "xrsb_quality" in goes_ts.columns:
+        good &= (data["xrsa_quality"].to_numpy() == 0) & (data["xrsb_quality"].to_numpy() == 0)
+    secondary = np.zeros(shortflux.shape)
+    if "xrsa_primary_chan" in goes_ts.columns:
+        secondary = _goesr_detector_index(
+            data["xrsa_primary_chan"].to_numpy(), data["xrsb_primary_chan"].to_numpy()
+        ).astype(float)
+        good &= secondary >= 0
+    frame = pd.DataFrame(
+        {
+            "xrsa": np.where(good, shortflux, np.nan),
+            "xrsb": np.where(good, longflux, np.nan),
+            "secondary": np.where(good, secondary, np.nan),
+        },
+        index=data.index,
+    )
+    resampled = frame.resample(frequency, origin=grid[0]).agg(
+        {"xrsa": "mean", "xrsb": "mean", "secondary": "first"}
+    )
+    return resampled.reindex(grid)
+
+
+class TemperatureEMUpdater:
+    """
+    Calculate the temperature and emission measure from a live stream of GOES/XRS observations.
+
+    This applies the same calculation as `calculate_temperature_em`, but the observations
+    are passed to `update` as they arrive, and only the new observations are processed.
+    The response splines for all the detectors of the satellite are prepared when the updater
+    is created, such that the time taken by each update is proportional to the number of
+    new observations. The results for the most recent ``buffer_size`` observations are kept
+    in a ring buffer of fixed size, which can be retrieved with `to_timeseries`.
+
+    Parameters
+    ----------
+    satellite_number : `int`
+        GOES satellite number.
+    abundance: str, optional
+        Which abundances to use for the calculation, the default is "coronal".
+        Can be either "coronal" or "photospheric".
+    remove_scaling: `bool`, optional
+        Whether to remove the SWPC scaling factors. This is only needed for the
+        older FITS files for GOES 8-15 XRS. Default is `False`.
+    buffer_size : `int`, optional
+        The number of most recent results which are kept. Default is 86400, i.e. one day of 1 s data.
+    fast : `bool`, optional
+        Whether to evaluate the response using dense lookup tables (see `calculate_temperature_em`).
+
+    See Also
+    --------
+    calculate_temperature_em, calculate_temperature_em_from_flux
+
+    Examples
+    --------
+    >>> from sunkit_instruments import goes_xrs
+    >>> updater = goes_xrs.TemperatureEMUpdater(16)  # doctest: +REMOTE_DATA
+    >>> for times, xrsa, xrsb, xrsa_primary_chan, xrsb_primary_chan in stream:  # doctest: +SKIP
+    ...     temperature, emission_measure = updater.update(
+    ...         times, xrsa, xrsb, xrsa_primary_chan=xrsa_primary_chan, xrsb_primary_chan=xrsb_primary_chan
+    ...     )  # doctest: +SKIP
+    >>> goes_temp_em = updater.to_timeseries()  # doctest: +SKIP
+    """
+
+    def __init__(self, satellite_number, abundance="coronal", remove_scaling=False, buffer_size=86400, fast=False):
+        _check_satellite_and_abundance(satellite_number, abundance)
+        if buffer_size < 1:
+            raise ValueError(f"The buffer size must be at least 1, not {buffer_size}.")
+        self.satellite_number = satellite_number
+        self.abundance = abundance
+        self.remove_scaling = remove_scaling
+        self.fast = fast
+        # Prepare the response of each detector combination, so that this is not done during an update.
+        if satellite_number <= 15:
+            sats = [satellite_number - 1]
         else:
-            remove_scaling = False
-        output = _chianti_temp_emiss(
-            goes_ts,
-            satellite_number,
-            abundance=abundance,
-            remove_scaling=remove_scaling,
+            sats = [15 + 4 * (satellite_number - 16) + secondary for secondary in range(4)]
+        for sat in sats:
+            _get_response_splines(sat, abundance)
+            if fast:
+                _get_response_lookup(sat, abundance)
+
+        self._time = np.zeros(buffer_size, dtype="datetime64[ns]")
+        self._temperature = np.full(buffer_size, np.nan)
+        self._emission_measure = np.full(buffer_size, np.nan)
+        self._next = 0
+        self._count = 0
+        self._warned_primary = False
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def buffer_size(self):
+        """
+        The number of most recent results which are kept.
+        """
+        return self._time.size
+
+    @u.quantity_input
+    def update(
+        self,
+        times,
+        xrsa: u.W / u.m**2,
+        xrsb: u.W / u.m**2,
+        xrsa_quality=None,
+        xrsb_quality=None,
+        xrsa_primary_chan=None,
+        xrsb_primary_chan=None,
+    ):
+        """
+        Calculate the temperature and emission measure for new observations.
+
+        Parameters
+        ----------
+        times : `~astropy.time.Time` or array-like of `numpy.datetime64`
+            The times of the new observations.
+        xrsa : `~astropy.units.Quantity`
+            The flux in the short (0.5-4 Angstrom) channel.
+        xrsb : `~astropy.units.Quantity`
+            The flux in the long (1-8 Angstrom) channel.
+        xrsa_quality, xrsb_quality : array-like, optional
+            Quality flags for each channel. Times where either flag is nonzero are set to NaN.
+        xrsa_primary_chan, xrsb_primary_chan : array-like, optional
+            The primary detector (1 or 2) used at each time for each channel for GOES-R.
+            If not given, the primary detectors are assumed for all times, and a warning
+            is emitted the first time this happens.
+
+        Returns
+        -------
+        temperature : `~astropy.units.Quantity`
+            The temperature for each new observation.
+        emission_measure : `~astropy.units.Quantity`
+            The volume emission measure for each new observation.
+        """
+        if isinstance(times, Time):
+            times = times.datetime64
+        times = np.atleast_1d(np.asarray(times, dtype="datetime64[ns]"))
+        if times.size == 0:
+            return u.Quantity([], u.MK), u.Quantity([], u.cm ** (-3))
+        secondary = 0
+        if self.satellite_number >= 16:
+            if xrsa_primary_chan is not None and xrsb_primary_chan is not None:
+                secondary = _goesr_detector_index(xrsa_primary_chan, xrsb_primary_chan)
+            elif not self._warned_primary:
+                warn_user("No information about primary/secondary detectors given, assuming primary for all")
+                self._warned_primary = True
+        temp, emission_measure = _temperature_emission_measure(
+            np.atleast_1d(xrsa.to_value(u.W / u.m**2)),
+            np.atleast_1d(xrsb.to_value(u.W / u.m**2)),
+            self.satellite_number,
+            # The date is only needed for GOES-6, and is not converted otherwise to save time.
+            Time(times[0]) if self.satellite_number == 6 else None,
+            secondary=secondary,
+            abundance=self.abundance,
+            remove_scaling=self.remove_scaling,
+            shortflux_quality=xrsa_quality,
+            longflux_quality=xrsb_quality,
+            fast=self.fast,
         )
+        self._append(times, temp, emission_measure)
+        return u.Quantity(temp, u.MK), u.Quantity(emission_measure * 1e49, u.cm ** (-3))
 
-    return output
+    def _append(self, times, temp, emission_measure):
+        """
+        Add results to the ring buffer, overwriting the oldest results once it is full.
+        """
+        size = self.buffer_size
+        # Only the last results can be kept if there are more than fit in the buffer
+        skip = max(times.size - size, 0)
+        index = (self._next + skip + np.arange(times.size - skip)) % size
+        self._time[index] = times[skip:]
+        self._temperature[index] = temp[skip:]
+        self._emission_measure[index] = emission_measure[skip:]
+        self._next = (self._next + times.size) % size
+        self._count = min(self._count + times.size, size)
+
+    def to_timeseries(self):
+        """
+        The results in the buffer, from the oldest to the most recent.
+
+        Returns
+        -------
+        `~sunpy.timeseries.GenericTimeSeries`
+            Contains the temperature and emission measure of the observations in the buffer.
+        """
+        index = (self._next - self._count + np.arange(self._count)) % self.buffer_size
+        df = pd.DataFrame(
+            {"temperature": self._temperature[index], "emission_measure": self._emission_measure[index] * 1e49},
+            index=pd.DatetimeIndex(self._time[index]),
+        )
+        units = {"temperature": u.MK, "emission_measure": u.cm ** (-3)}
+        header = {"Info": "Estimated temperature and emission measure"}
+        return ts.TimeSeries(df, header, units)
+
+
+def _append_temperature_em(filename, temp_em):
+    """
+    Append the temperature and emission measure in a timeseries to resizable datasets in a HDF5 file.
+    """
+    data = temp_em.to_dataframe()
+    columns = {
+        "time": (data.index.to_numpy(dtype="datetime64[ns]").view("int64"), "ns"),
+        "temperature": (data["temperature"].to_numpy(), temp_em.units["temperature"]),
+        "emission_measure": (data["emission_measure"].to_numpy(), temp_em.units["emission_measure"]),
+    }
+    with h5py.File(filename, "a") as f:
+        for name, (values, unit) in columns.items():
+            if name not in f:
+                dset = f.create_dataset(name, shape=(0,), maxshape=(None,), dtype=values.dtype, chunks=True)
+                dset.attrs["unit"] = u.Unit(unit).to_string()
+            dset = f[name]
+            n_existing = dset.shape[0]
+            dset.resize((n_existing + values.size,))
+            dset[n_existing:] = values
 
 
-@manager.require(
-    "goes_chianti_response_table",
-    [
-        "https://sohoftp.nascom.nasa.gov/solarsoft/gen/idl/synoptic/goes/goes_chianti_response_latest.fits"
-    ],
-    "cb00c05850e3dc3bbd856eb07c1a372758d689d0845ee591d6e2531afeab0382",
-)
 def _chianti_temp_emiss(
-    goes_ts, satellite_number, secondary=0, abundance="coronal", remove_scaling=False
+    goes_ts,
+    satellite_number,
+    secondary=0,
+    abundance="coronal",
+    remove_scaling=False,
+    xrsa_uncertainty=None,
+    xrsb_uncertainty=None,
+    fast=False,
+    background_window=None,
+    background_percentile=0,
 ):
     """
     Calculate isothermal temperature and emission measure from GOES XRS observations.
@@ -159,8 +840,9 @@ def _chianti_temp_emiss(
         The GOES XRS timeseries containing the data of both the xrsa and xrsb channels (in units of W/m**2).
     sat : `int`
         GOES satellite number.
-    secondary: `int`, optional
+    secondary: `int` or `numpy.ndarray`, optional
         Values 0, 1, 2, 3 indicate A1+B1, A2+B1, A1+B2, A2+B2 detector combos for GOES-R.
+        This can also be an array giving the detector combination for each time.
         Defaults to 0.
     abundance: str, optional
         Which abundances to use for the calculation, the default is "coronal".
@@ -169,6 +851,16 @@ def _chianti_temp_emiss(
         Checks whether to remove the SWPC scaling factors.
         This is only an issue for the older FITS files for GOES 8-15 XRS.
         Default is `False` as the netcdf files have the "true" fluxes.
+    xrsa_uncertainty, xrsb_uncertainty : `~astropy.units.Quantity`, optional
+        The uncertainty of the flux in each channel, which are propagated to the
+        temperature and emission measure if either is given.
+    fast : `bool`, optional
+        Whether to evaluate the response using the dense lookup tables.
+    background_window : `~astropy.units.Quantity`, optional
+        If given, the rolling background over this window is subtracted from the flux in
+        each channel before the flux ratio is calculated (see `_rolling_background`).
+    background_percentile : `float`, optional
+        The percentile of the flux in the window used as the background.
 
     Returns
     -------
@@ -177,6 +869,8 @@ def _chianti_temp_emiss(
         The two columns are:
             ``temperature`` : The temperature in MK.
             ``emission `measure` : The volume emission measure.
+        If a flux uncertainty is given, there are also the columns
+        ``temperature_uncertainty`` and ``emission_measure_uncertainty``.
     Notes
     -----
     Requires goes_chianti_resp.fits produced by goes_chianti_response.pro
@@ -188,98 +882,421 @@ def _chianti_temp_emiss(
     the satellite number to be passed to this function should be the actual GOES satellite number.
     """
 
-    longflux = goes_ts.quantity("xrsb").to(u.W / u.m**2)
-    shortflux = goes_ts.quantity("xrsa").to(u.W / u.m**2)
+    data = goes_ts.to_dataframe()
+    longflux = goes_ts.quantity("xrsb").to_value(u.W / u.m**2)
+    shortflux = goes_ts.quantity("xrsa").to_value(u.W / u.m**2)
 
+    shortflux_quality = longflux_quality = None
     if "xrsb_quality" in goes_ts.columns:
-        longflux[goes_ts.to_dataframe()["xrsb_quality"] != 0] = np.nan
-        shortflux[goes_ts.to_dataframe()["xrsa_quality"] != 0] = np.nan
+        shortflux_quality = data["xrsa_quality"].to_numpy()
+        longflux_quality = data["xrsb_quality"].to_numpy()
+
+    if background_window is not None:
+        shortflux = shortflux - _rolling_background(
+            data.index, shortflux, background_window, background_percentile, quality=shortflux_quality
+        )
+        longflux = longflux - _rolling_background(
+            data.index, longflux, background_window, background_percentile, quality=longflux_quality
+        )
 
     obsdate = parse_time(goes_ts._data.index[0])
 
-    longflux_corrected = longflux
+    result = _temperature_emission_measure(
+        shortflux,
+        longflux,
+        satellite_number,
+        obsdate,
+        secondary=secondary,
+        abundance=abundance,
+        remove_scaling=remove_scaling,
+        shortflux_quality=shortflux_quality,
+        longflux_quality=longflux_quality,
+        shortflux_uncertainty=_flux_value(xrsa_uncertainty),
+        longflux_uncertainty=_flux_value(xrsb_uncertainty),
+        fast=fast,
+    )
+
+    goes_times = goes_ts._data.index
+    columns = {"temperature": result[0], "emission_measure": result[1] * 1e49}
+    units = {"temperature": u.MK, "emission_measure": u.cm ** (-3)}
+    if len(result) == 4:
+        columns["temperature_uncertainty"] = result[2]
+        columns["emission_measure_uncertainty"] = result[3] * 1e49
+        units["temperature_uncertainty"] = u.MK
+        units["emission_measure_uncertainty"] = u.cm ** (-3)
+    df = pd.DataFrame(columns, index=goes_times)
+
+    header = {"Info": "Estimated temperature and emission measure"}
+
+    # return a new timeseries with temperature and emission measure
+    temp_em = ts.TimeSeries(df, header, units)
+
+    return temp_em
+
+
+def _rolling_background(times, flux, window, percentile=0, quality=None):
+    """
+    The background flux at each time, given by a percentile of the flux in a window up to that time.
+
+    Fluxes which are not finite, or have a nonzero quality flag, are not included in the background.
+    The rolling minimum is calculated in a time proportional to the number of samples, while other
+    percentiles take a time proportional to the number of samples times the logarithm of the
+    number of samples in the window.
+
+    Parameters
+    ----------
+    times : `pandas.DatetimeIndex`
+        The time of each sample.
+    flux : `numpy.ndarray`
+        The flux.
+    window : `~astropy.units.Quantity`
+        The length of time up to and including each time used to find the background.
+    percentile : `float`, optional
+        The percentile of the flux in the window used as the background. Default is 0,
+        i.e. the minimum flux.
+    quality : `numpy.ndarray`, optional
+        Quality flags for the flux.
+
+    Returns
+    -------
+    `numpy.ndarray`
+        The background flux. This is NaN for times without any good flux in the window.
+    """
+    if not 0 <= percentile <= 100:
+        raise ValueError(f"The background percentile must be between 0 and 100, not {percentile}.")
+    good = np.isfinite(flux)
+    if quality is not None:
+        good &= np.asarray(quality) == 0
+    flux = pd.Series(np.where(good, flux, np.nan), index=times)
+    rolling = flux.rolling(pd.Timedelta(window.to_value(u.s), "s"), min_periods=1)
+    if percentile == 0:
+        return rolling.min().to_numpy()
+    return rolling.quantile(percentile / 100).to_numpy()
+
+
+def _temperature_emission_measure(
+    shortflux,
+    longflux,
+    satellite_number,
+    obsdate,
+    secondary=0,
+    abundance="coronal",
+    remove_scaling=False,
+    shortflux_quality=None,
+    longflux_quality=None,
+    shortflux_uncertainty=None,
+    longflux_uncertainty=None,
+    fast=False,
+):
+    """
+    Calculate the temperature and emission measure from arrays of GOES XRS fluxes.
+
+    See `_chianti_temp_emiss` for a description of the method.
+
+    Parameters
+    ----------
+    shortflux : `numpy.ndarray`
+        The xrsa flux in W/m**2.
+    longflux : `numpy.ndarray`
+        The xrsb flux in W/m**2.
+    satellite_number : `int` or `numpy.ndarray`
+        GOES satellite number, either for all times or for each time.
+        Times with an unsupported satellite number are set to NaN.
+    obsdate : `~astropy.time.Time`
+        Date of the observations. This is only used for GOES-6, so can be `None` otherwise.
+    secondary: `int` or `numpy.ndarray`, optional
+        Detector combination for GOES-R, either for all times or for each time.
+        Times with a value outside of 0-3 are set to NaN.
+    abundance: str, optional
+        Either "coronal" or "photospheric".
+    remove_scaling: `bool` or `numpy.ndarray`, optional
+        Whether to remove the SWPC scaling factors, either for all times or for each time.
+    shortflux_quality, longflux_quality : `numpy.ndarray`, optional
+        Quality flags for each channel. Fluxes where either flag is nonzero are set to NaN.
+    shortflux_uncertainty, longflux_uncertainty : `float` or `numpy.ndarray`, optional
+        The uncertainty of the xrsa and xrsb fluxes in W/m**2. If either is given, the
+        uncertainties of the temperature and emission measure are also returned. A missing
+        uncertainty is taken to be zero.
+    fast : `bool`, optional
+        If `True`, the splines are evaluated using a dense lookup table (see `_get_response_lookup`).
+
+    Returns
+    -------
+    temperature : `numpy.ndarray`
+        The temperature in MK.
+    emission_measure : `numpy.ndarray`
+        The volume emission measure in units of 1e49 cm**-3.
+    temperature_uncertainty : `numpy.ndarray`
+        The uncertainty of the temperature in MK. Only returned if a flux uncertainty is given.
+    emission_measure_uncertainty : `numpy.ndarray`
+        The uncertainty of the emission measure in units of 1e49 cm**-3.
+        Only returned if a flux uncertainty is given.
+
+    Notes
+    -----
+    The uncertainties are propagated to first order, assuming the uncertainties of the two
+    channels are independent. With the temperature given by the ratio spline :math:`T = g(a / b)`
+    and the emission measure by the flux spline :math:`EM = b / f(T)`, the partial derivatives
+    with respect to the short (:math:`a`) and long (:math:`b`) channel fluxes are
+    calculated from the analytic derivatives of the splines, :math:`g'` and :math:`f'`.
+    Where the fluxes are too low to be considered good, the flux ratio is fixed and so
+    the temperature uncertainty is zero.
+    """
+    shortflux = np.asarray(shortflux, dtype=float)
+    longflux = np.asarray(longflux, dtype=float)
+    if longflux_quality is not None:
+        longflux = np.where(np.asarray(longflux_quality) != 0, np.nan, longflux)
+    if shortflux_quality is not None:
+        shortflux = np.where(np.asarray(shortflux_quality) != 0, np.nan, shortflux)
+
+    satellite_number = np.asarray(satellite_number)
     # For some reason that I can't find documented anywhere other than in the IDL code,
     # the long channel needs to be scaled by this value for GOES-6 before 1983-06-28.
-    if obsdate <= Time("1983-06-28") and satellite_number == 6:
-        longflux_corrected = longflux * (4.43 / 5.32)
+    goes6_correction = satellite_number == 6
+    if np.any(goes6_correction):
+        goes6_correction = goes6_correction & (obsdate <= Time("1983-06-28"))
+    longflux_scale = np.where(goes6_correction, 4.43 / 5.32, 1.0)
 
-    shortflux_corrected = shortflux
     # Remove the SWPC scaling factors if needed.
     # The SPWC scaling factors of 0.7 and 0.85 for the XRSA and XSRB channels
     # respectively are documented in the NOAA readme file linked in the docstring.
-    if remove_scaling and satellite_number >= 8 and satellite_number < 16:
-        longflux_corrected = longflux_corrected / 0.7
-        shortflux_corrected = shortflux / 0.85
+    swpc_scaled = np.asarray(remove_scaling) & (satellite_number >= 8) & (satellite_number < 16)
+    longflux_scale = np.where(swpc_scaled, longflux_scale / 0.7, longflux_scale)
+    shortflux_scale = np.where(swpc_scaled, 1 / 0.85, 1.0)
+
+    longflux_corrected = longflux * longflux_scale
+    shortflux_corrected = shortflux * shortflux_scale
 
     # Measurements of short channel flux of less than 1e-10 W/m**2 or
     # long channel flux less than 3e-8 W/m**2 are not considered good.
     # Ratio values corresponding to such fluxes are set to 0.003.
     index = np.logical_or(
-        shortflux_corrected < u.Quantity(1e-10 * u.W / u.m**2),
-        longflux_corrected < u.Quantity(3e-8 * u.W / u.m**2),
+        shortflux_corrected < 1e-10,
+        longflux_corrected < 3e-8,
     )
-    fluxratio = shortflux_corrected / longflux_corrected
-    fluxratio.value[index] = u.Quantity(0.003, unit=u.dimensionless_unscaled)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fluxratio = shortflux_corrected / longflux_corrected
+    fluxratio[index] = 0.003
 
     # Work out detector index to use from the table response based on satellite number
     # The counting in the table starts at 0, and indexed in an odd way for the GOES-R
     # primary/secondary detectors.
-    if satellite_number <= 15:
-        sat = satellite_number - 1  # counting starts at 0
+    secondary = np.asarray(secondary)
+    sat = np.where(
+        satellite_number <= 15,
+        satellite_number - 1,  # counting starts at 0
+        15 + 4 * (satellite_number - 16) + secondary,  # to figure out which detector response table to use (see notes)
+    )
+
+    propagate_uncertainty = shortflux_uncertainty is not None or longflux_uncertainty is not None
+
+    # Calculate the temperature and emission measure, using the splines for
+    # the detectors used at each time. The derivatives of the splines are
+    # only needed to propagate the uncertainties.
+    temp = np.full(fluxratio.shape, np.nan)
+    denom = np.full(fluxratio.shape, np.nan)
+    dtemp_dratio = np.full(fluxratio.shape, np.nan)
+    ddenom_dtemp = np.full(fluxratio.shape, np.nan)
+    if np.ndim(sat) == 0:
+        sats = [(sat, ...)]
     else:
-        sat = (
-            15 + 4 * (satellite_number - 16) + secondary
-        )  # to figure out which detector response table to use (see notes)
+        valid = (
+            (satellite_number >= 1)
+            & (satellite_number <= MAX_SUPPORTED_SATELLITE)
+            & ((satellite_number <= 15) | ((secondary >= 0) & (secondary <= 3)))
+        )
+        sats = [(sat_i, (sat == sat_i) & valid) for sat_i in np.unique(sat[valid])]
+    for sat_i, in_sat in sats:
+        ratio_spline, flux_spline = _get_response_splines(int(sat_i), abundance)
+        lookup = _get_response_lookup(int(sat_i), abundance) if fast else None
+        if lookup is not None:
+            temp[in_sat], denom[in_sat] = _evaluate_lookup(lookup, fluxratio[in_sat], ratio_spline, flux_spline)
+        else:
+            temp[in_sat] = interpolate.splev(fluxratio[in_sat], ratio_spline, der=0)
+            denom[in_sat] = interpolate.splev(temp[in_sat], flux_spline, der=0)
+        if propagate_uncertainty:
+            dtemp_dratio[in_sat] = interpolate.splev(fluxratio[in_sat], ratio_spline, der=1)
+            ddenom_dtemp[in_sat] = interpolate.splev(temp[in_sat], flux_spline, der=1)
+
+    emission_measure = longflux_corrected / denom
+
+    if not propagate_uncertainty:
+        return temp, emission_measure
+
+    shortflux_uncertainty = shortflux_scale * np.asarray(
+        0.0 if shortflux_uncertainty is None else shortflux_uncertainty, dtype=float
+    )
+    longflux_uncertainty = longflux_scale * np.asarray(
+        0.0 if longflux_uncertainty is None else longflux_uncertainty, dtype=float
+    )
+    # The ratio is fixed for low fluxes, so does not depend on the fluxes.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dtemp_dshort = np.where(index, 0.0, dtemp_dratio / longflux_corrected)
+        dtemp_dlong = np.where(index, 0.0, -dtemp_dratio * fluxratio / longflux_corrected)
+    dlogdenom_dtemp = ddenom_dtemp / denom
+    dem_dshort = -emission_measure * dlogdenom_dtemp * dtemp_dshort
+    dem_dlong = 1 / denom - emission_measure * dlogdenom_dtemp * dtemp_dlong
+    temp_uncertainty = np.hypot(dtemp_dshort * shortflux_uncertainty, dtemp_dlong * longflux_uncertainty)
+    emission_measure_uncertainty = np.hypot(
+        dem_dshort * shortflux_uncertainty, dem_dlong * longflux_uncertainty
+    )
+
+    return temp, emission_measure, temp_uncertainty, emission_measure_uncertainty
+
+
+@functools.cache
+@manager.require(
+    "goes_chianti_response_table",
+    [
+        "https://sohoftp.nascom.nasa.gov/solarsoft/gen/idl/synoptic/goes/goes_chianti_response_latest.fits"
+    ],
+    "cb00c05850e3dc3bbd856eb07c1a372758d689d0845ee591d6e2531afeab0382",
+)
+def _get_response_table():
+    """
+    Read the GOES CHIANTI response table.
 
+    The table is only read from disk once, after which the parsed columns are cached.
+
+    Returns
+    -------
+    `dict`
+        The columns of the response table needed to calculate the temperature and emission measure.
+    """
     resp_file_name = manager.get("goes_chianti_response_table")
     response_table = fits.getdata(resp_file_name, extension=1)
-    rcor = response_table.FSHORT_COR / response_table.FLONG_COR  # coronal
-    rpho = response_table.FSHORT_PHO / response_table.FLONG_PHO  # photospheric
+    columns = ["TEMP_MK", "ALOG10EM", "FSHORT_COR", "FLONG_COR", "FSHORT_PHO", "FLONG_PHO"]
+    return {name: np.array(response_table[name], dtype=float) for name in columns}
+
+
+@functools.cache
+def _get_response_splines(sat, abundance):
+    """
+    Spline fits to the GOES CHIANTI response table for a given detector.
+
+    The splines are only fit once for each detector and abundance, after which they are cached.
+
+    Parameters
+    ----------
+    sat : `int`
+        Row of the response table, counting from 0 (see `_chianti_temp_emiss`).
+    abundance : `str`
+        Either "coronal" or "photospheric".
+
+    Returns
+    -------
+    ratio_spline : `tuple`
+        Spline representation of the temperature (in MK) as a function of the flux ratio.
+    flux_spline : `tuple`
+        Spline representation of the long channel flux per unit emission measure (in units
+        of 1e49 cm-3) as a function of temperature.
+    """
+    response_table = _get_response_table()
+    suffix = "COR" if abundance == "coronal" else "PHO"
+    modeltemp = response_table["TEMP_MK"][sat]
+    modelflux = response_table[f"FLONG_{suffix}"][sat]
+    modelratio = response_table[f"FSHORT_{suffix}"][sat] / modelflux
 
     table_to_response_em = 10.0 ** (
         49.0 - response_table["ALOG10EM"][sat]
     )  # for some reason in units of 1e49 (which was to stop overflow errors since 10^49 was
     # too big to express as a standard float in IDL.)
 
-    modeltemp = response_table["TEMP_MK"][sat]
-    modelratio = rcor[sat] if abundance == "coronal" else rpho[sat]
-
-    # Calculate the temperature and emission measure:
-
     # get spline fit to model data to get temperatures given the input flux ratio.
-    spline = interpolate.splrep(modelratio, modeltemp, s=0)
-    temp = interpolate.splev(fluxratio, spline, der=0)
+    ratio_spline = interpolate.splrep(modelratio, modeltemp, s=0)
+    flux_spline = interpolate.splrep(modeltemp, modelflux * table_to_response_em, s=0)
+    return ratio_spline, flux_spline
 
-    modelflux = (
-        response_table["FLONG_COR"][sat]
-        if abundance == "coronal"
-        else response_table["FLONG_PHO"][sat]
-    )
-
-    modeltemp = response_table["TEMP_MK"][sat]
 
-    spline = interpolate.splrep(modeltemp, modelflux * table_to_response_em, s=0)
-    denom = interpolate.splev(temp, spline, der=0)
+@functools.cache
+def _get_response_lookup(sat, abundance):
+    """
+    Dense lookup table of the response splines for a given detector.
 
-    emission_measure = longflux_corrected.value / denom
+    The temperature given by the ratio spline, and the flux per unit emission measure
+    given by the flux spline at that temperature, are tabulated on a grid which is
+    evenly spaced in the logarithm of the flux ratio. Both can then be evaluated with a
+    single index calculation and a linear interpolation, rather than searching the knots
+    of two splines. The grid is refined until the linear interpolation differs from the
+    splines by less than half of ``LOOKUP_RTOL`` at the midpoints between the grid
+    points, where the difference is largest. If this is not reached before the grid
+    has ``_MAX_LOOKUP_SIZE`` points, a warning is emitted and there is no lookup table,
+    such that the splines are used instead. The lookup table is only calculated once
+    for each detector and abundance.
 
-    goes_times = goes_ts._data.index
-    df = pd.DataFrame(
-        {"temperature": temp, "emission_measure": emission_measure * 1e49},
-        index=goes_times,
-    )
+    Parameters
+    ----------
+    sat : `int`
+        Row of the response table, counting from 0 (see `_chianti_temp_emiss`).
+    abundance : `str`
+        Either "coronal" or "photospheric".
 
-    units = {"temperature": u.MK, "emission_measure": u.cm ** (-3)}
+    Returns
+    -------
+    `tuple` or `None`
+        The lookup table ``(log_ratio_min, step, temperature, flux)``, or `None` if it
+        cannot meet the tolerance. These are the natural logarithm of the first flux ratio
+        in the grid, the spacing of the grid in the natural logarithm of the flux ratio,
+        and the temperature (in MK) and long channel flux per unit emission measure
+        (in units of 1e49 cm-3) at each flux ratio in the grid.
+    """
+    ratio_spline, flux_spline = _get_response_splines(sat, abundance)
+    knots = ratio_spline[0]
+    log_ratio_min, log_ratio_max = np.log(knots[0]), np.log(knots[-1])
+    size = 1024
+    while True:
+        # Evaluate at the grid points and the midpoints between them together
+        log_ratio, step = np.linspace(log_ratio_min, log_ratio_max, 2 * size - 1, retstep=True)
+        temperature = interpolate.splev(np.exp(log_ratio), ratio_spline)
+        flux = interpolate.splev(temperature, flux_spline)
+        deviation = max(
+            np.max(np.abs((values[:-2:2] + values[2::2]) / 2 / values[1::2] - 1))
+            for values in [temperature, flux]
+        )
+        if deviation <= LOOKUP_RTOL / 2:
+            return log_ratio_min, 2 * step, temperature[::2], flux[::2]
+        if size >= _MAX_LOOKUP_SIZE:
+            warn_user(
+                f"The lookup table of the GOES response for row {sat} and {abundance} abundances "
+                f"differs from the splines by up to {deviation:.2g}, more than LOOKUP_RTOL / 2, "
+                "so the splines are used instead."
+            )
+            return None
+        size *= 2
 
-    header = {"Info": "Estimated temperature and emission measure"}
 
-    # return a new timeseries with temperature and emission measure
-    temp_em = ts.TimeSeries(df, header, units)
+def _evaluate_lookup(lookup, fluxratio, ratio_spline, flux_spline):
+    """
+    Evaluate the temperature and flux per unit emission measure using a lookup table.
 
-    return temp_em
+    Flux ratios outside of the lookup table are evaluated using the splines.
+    """
+    log_ratio_min, step, temperature, flux = lookup
+    with np.errstate(divide="ignore", invalid="ignore"):
+        position = (np.log(fluxratio) - log_ratio_min) / step
+    inside = (position >= 0) & (position <= temperature.size - 1)
+    position = np.where(inside, position, 0)
+    index = np.minimum(position.astype(np.intp), temperature.size - 2)
+    weight = position - index
+    temp = temperature[index] + weight * (temperature[index + 1] - temperature[index])
+    denom = flux[index] + weight * (flux[index + 1] - flux[index])
+    if not inside.all():
+        outside = ~inside
+        temp[outside] = interpolate.splev(fluxratio[outside], ratio_spline)
+        denom[outside] = interpolate.splev(temp[outside], flux_spline)
+    return temp, denom
 
 
-def _manage_goesr_detectors(goes_ts, satellite_number, abundance="coronal"):
+def _manage_goesr_detectors(
+    goes_ts,
+    satellite_number,
+    abundance="coronal",
+    xrsa_uncertainty=None,
+    xrsb_uncertainty=None,
+    fast=False,
+    background_window=None,
+    background_percentile=0,
+):
     """
     This manages which response to use for the GOES primary and secondary detectors used in the
     observations for the GOES-R satellites (i.e. GOES 16 and 17).
@@ -290,33 +1307,46 @@ def _manage_goesr_detectors(goes_ts, satellite_number, abundance="coronal"):
     response, we need to match the data at individual times with the correct response.
 
     Note that the primary channel conditions are values of 0,1,2,3 to indicate A1+B1, A2+B1, A1+B2, A2+B2 detector combos for GOES-R.
-    Here, we use the `xrsa{b}_primary_chan` columns to figure out which detectors are used for each timestep.
+    Here, we use the `xrsa{b}_primary_chan` columns to figure out which detectors are used for each timestep,
+    and the response for the corresponding detectors is then used for each timestep in a single pass,
+    such that the order of the timeseries is preserved.
     """
 
-    # These are the conditions for which detector combinations to use.
-    secondary_det_conditions = {0: [1, 1], 1: [2, 1], 2: [1, 2], 3: [2, 2]}
+    secondary = _goesr_detector_index(
+        goes_ts.quantity("xrsa_primary_chan").value,
+        goes_ts.quantity("xrsb_primary_chan").value,
+    )
+    return _chianti_temp_emiss(
+        goes_ts,
+        satellite_number,
+        abundance=abundance,
+        secondary=secondary,
+        xrsa_uncertainty=xrsa_uncertainty,
+        xrsb_uncertainty=xrsb_uncertainty,
+        fast=fast,
+        background_window=background_window,
+        background_percentile=background_percentile,
+    )
 
-    # here we split the timeseries into sections for which primary or secondary detectors are used
-    # and then calculate the response for each and then concatenate them back together.
-    outputs = []
-    for k in secondary_det_conditions:
-        dets = secondary_det_conditions[k]
-        (second_ind,) = np.where(
-            (goes_ts.quantity("xrsa_primary_chan") == dets[0])
-            & (goes_ts.quantity("xrsb_primary_chan") == dets[1])
-        )
 
-        goes_split = ts.TimeSeries(goes_ts._data.iloc[second_ind], goes_ts.units)
+def _goesr_detector_index(xrsa_primary_chan, xrsb_primary_chan):
+    """
+    Index of the GOES-R detector combination used at each time.
 
-        if len(goes_split._data) > 0:
-            output = _chianti_temp_emiss(
-                goes_split, satellite_number, abundance=abundance, secondary=int(k)
-            )
-            outputs.append(output)
+    Values of 0, 1, 2, 3 indicate A1+B1, A2+B1, A1+B2, A2+B2 detector combos.
+    Times where either primary channel is not 1 or 2, including missing (NaN)
+    values, are given an index of -1.
+    """
+    xrsa_primary_chan = _channel_number(xrsa_primary_chan)
+    xrsb_primary_chan = _channel_number(xrsb_primary_chan)
+    valid = np.isin(xrsa_primary_chan, [1, 2]) & np.isin(xrsb_primary_chan, [1, 2])
+    index = (xrsa_primary_chan - 1) + 2 * (xrsb_primary_chan - 1)
+    return np.where(valid, index, -1)
 
-    if len(outputs) > 1:
-        full_output = outputs[0].concatenate(outputs[1:])
-    else:
-        full_output = outputs[0]
 
-    return full_output
+def _channel_number(primary_chan):
+    """
+    Primary channel numbers as integers, with non-finite values set to 0.
+    """
+    primary_chan = np.asarray(primary_chan, dtype=float)
+    return np.where(np.isfinite(primary_chan), primary_chan, 0).astype(int)
@@ -1,6 +1,9 @@
 import numpy as np
 
 from astropy import units as u
+from astropy.coordinates import BaseCoordinateFrame
+from astropy.table import QTable
+from astropy.time import Time
 
 from sunpy.time import parse_time
 
@@ -12,6 +15,10 @@ GOES_CONVERSION_DICT = {
     "A": u.Quantity(1e-8, "W/m^2"),
 }
 
+# The flare class letters, in order of increasing flux
+_CLASS_LETTERS = np.array(sorted(GOES_CONVERSION_DICT, key=lambda letter: GOES_CONVERSION_DICT[letter]))
+_CLASS_FLUX = u.Quantity([GOES_CONVERSION_DICT[letter] for letter in _CLASS_LETTERS])
+
 __all__ = [
     "get_goes_event_list",
     "flux_to_flareclass",
@@ -19,7 +26,7 @@ __all__ = [
 ]
 
 
-def get_goes_event_list(timerange, goes_class_filter=None):
+def get_goes_event_list(timerange, goes_class_filter=None, as_table=False):
     """
     Retrieve list of flares detected by GOES within a given time range.
 
@@ -29,12 +36,28 @@ def get_goes_event_list(timerange, goes_class_filter=None):
         The time range to download the event list for.
     goes_class_filter: `str`, optional
         A string specifying a minimum GOES class for inclusion in the list,
-        e.g., "M1", "X2".
+        e.g., "M1", "X2". Flares with a class of at least this, i.e. with a flux
+        greater than or equal to the flux of this class, are included. Flares without
+        a valid GOES class are excluded.
+    as_table : `bool`, optional
+        If `True`, return the flares as a table rather than a list of dictionaries.
+        The times of all the flares are parsed together, which is much faster for
+        long time ranges with many flares. Default is `False`.
 
     Returns
     -------
-    `list`:
+    `list` or `~astropy.table.QTable`:
         A list of all the flares found for the given time range.
+        If ``as_table`` is `True`, this is a table with the columns ``event_date``,
+        ``start_time``, ``peak_time``, ``end_time``, ``goes_class``, ``goes_flux``
+        (the flux corresponding to the GOES class), ``goes_location`` (the
+        Stonyhurst heliographic longitude and latitude of the event),
+        ``noaa_active_region`` and ``event_id``. Missing values of ``noaa_active_region``
+        are masked, and missing locations are NaN.
+
+    See Also
+    --------
+    GOESFlareCatalog
     """
     # Importing hek here to avoid calling code that relies on optional dependencies.
     from sunpy import __version__ as sunpy_version
@@ -52,9 +75,12 @@ def get_goes_event_list(timerange, goes_class_filter=None):
         result = client.search(
             attrs.Time(tstart, tend),
             attrs.hek.EventType(event_type),
-            attrs.hek.FL.GOESCls > goes_class_filter,
+            attrs.hek.FL.GOESCls >= goes_class_filter,
             attrs.hek.OBS.Observatory == "GOES",
         )
+        # Also filter by flux, such that the same rule is applied as for GOESFlareCatalog
+        keep = _event_flux([r["fl_goescls"] for r in result]) >= flareclass_to_flux(goes_class_filter)
+        result = [r for r, keep_event in zip(result, keep) if keep_event]
     else:
         result = client.search(
             attrs.Time(tstart, tend),
@@ -62,6 +88,9 @@ def get_goes_event_list(timerange, goes_class_filter=None):
             attrs.hek.OBS.Observatory == "GOES",
         )
 
+    if as_table:
+        return _hek_event_table(result)
+
     # want to condense the results of the query into a more manageable
     # dictionary
     # keep event data, start time, peak time, end time, GOES-class,
@@ -88,24 +117,155 @@ def get_goes_event_list(timerange, goes_class_filter=None):
     return goes_event_list
 
 
+def _hek_event_table(result):
+    """
+    Table of the GOES flare events returned by a HEK query.
+
+    The times of all the events are parsed together, and the flux corresponding to
+    each GOES class is calculated for all the events at once. Events without a valid
+    GOES class are given a flux of NaN. The locations are converted to Stonyhurst
+    heliographic coordinates, such that they can be compared between events given
+    in different coordinate frames, and missing locations are NaN. Missing NOAA
+    active region numbers are masked.
+    """
+    rows = list(result)
+    table = QTable()
+    for name, hek_name in [
+        ("start_time", "event_starttime"),
+        ("peak_time", "event_peaktime"),
+        ("end_time", "event_endtime"),
+    ]:
+        table[name] = _parse_times([r[hek_name] for r in rows])
+    table.add_column(np.asarray(table["start_time"].strftime("%Y-%m-%d"), dtype=str), name="event_date", index=0)
+    goes_class = _event_class([r["fl_goescls"] for r in rows])
+    table["goes_class"] = goes_class
+    table["goes_flux"] = _event_flux(goes_class)
+    table["goes_location"] = _stonyhurst_locations([r["event_coord"] for r in rows])
+    noaa_active_region = [r["ar_noaanum"] for r in rows]
+    missing = np.array([_is_missing(value) for value in noaa_active_region], dtype=bool)
+    table["noaa_active_region"] = np.ma.array(
+        [0 if is_missing else value for value, is_missing in zip(noaa_active_region, missing)],
+        mask=missing,
+        dtype=np.int64,
+    )
+    table["event_id"] = np.array([str(r["kb_archivid"]) for r in rows], dtype=str)
+    return table
+
+
+def _is_missing(value):
+    """
+    Whether a value in a HEK event is missing.
+    """
+    return value is None or value is np.ma.masked
+
+
+def _event_class(goes_class):
+    """
+    The GOES classes of HEK events as an array of strings, with missing classes as empty strings.
+    """
+    return np.array(["" if _is_missing(value) else str(value) for value in goes_class], dtype=str)
+
+
+def _event_flux(goes_class):
+    """
+    The fluxes corresponding to the GOES classes of HEK events, or NaN for events without a valid class.
+    """
+    flux, _, _ = _parse_flareclass(_event_class(goes_class))
+    return flux
+
+
+def _stonyhurst_locations(event_coords):
+    """
+    The Stonyhurst heliographic longitudes and latitudes of the coordinates of HEK events.
+
+    The coordinates are grouped by their frame and representation, and each group is
+    combined into a single array coordinate, such that each group is only transformed
+    once. Missing coordinates are given a location of NaN.
+    """
+    # Importing sunpy.coordinates here as it is only needed for the HEK events.
+    from sunpy.coordinates import HeliographicStonyhurst
+
+    locations = np.full((len(event_coords), 2), np.nan)
+    groups = {}
+    for i, event_coord in enumerate(event_coords):
+        if not _is_missing(event_coord):
+            groups.setdefault(_frame_key(event_coord.frame), []).append(i)
+    for indices in groups.values():
+        frame = _combine_frames([event_coords[i].frame for i in indices])
+        if not isinstance(frame, HeliographicStonyhurst):
+            frame = frame.transform_to(HeliographicStonyhurst(obstime=frame.obstime))
+        locations[indices, 0] = frame.lon.to_value(u.deg)
+        locations[indices, 1] = frame.lat.to_value(u.deg)
+    return u.Quantity(locations, u.deg)
+
+
+def _frame_key(frame):
+    """
+    The properties of a scalar coordinate frame which must be the same for frames to
+    be combined into a single array frame.
+
+    These are the frame class, the representation, whether there is an ``obstime``,
+    whether the ``observer`` is a coordinate, and any other frame attributes which are
+    not the defaults.
+    """
+    attributes = tuple(
+        (name, str(getattr(frame, name)))
+        for name in sorted(frame.frame_attributes)
+        if name not in ("obstime", "observer") and not frame.is_frame_attr_default(name)
+    )
+    observer = getattr(frame, "observer", None)
+    observer_key = "coordinate" if isinstance(observer, BaseCoordinateFrame) else observer
+    return type(frame), type(frame.data), frame.obstime is None, observer_key, attributes
+
+
+def _combine_frames(frames):
+    """
+    Combine scalar coordinate frames with the same `_frame_key` into a single array frame.
+    """
+    first = frames[0]
+    components = []
+    for name in first.data.components:
+        unit = getattr(first.data, name).unit
+        components.append(u.Quantity([getattr(frame.data, name).to_value(unit) for frame in frames], unit))
+    attributes = {name: getattr(first, name) for name in first.frame_attributes}
+    if first.obstime is not None:
+        attributes["obstime"] = Time([frame.obstime for frame in frames])
+    if isinstance(attributes.get("observer"), BaseCoordinateFrame):
+        attributes["observer"] = _combine_frames([frame.observer for frame in frames])
+    return type(first)(type(first.data)(*components), **attributes)
+
+
+def _parse_times(times):
+    """
+    Parse a sequence of times in a single call, allowing for an empty sequence.
+    """
+    if len(times) == 0:
+        return Time(np.array([], dtype=str), format="isot", scale="utc")
+    return parse_time(times)
+
+
 def flareclass_to_flux(flareclass):
     """
     Converts a GOES flare class into the corresponding X-ray flux.
 
     Parameters
     ----------
-    flareclass : str
-        The case-insensitive flare class (e.g., 'X3.2', 'm1.5', 'A9.6').
+    flareclass : str or array-like of str
+        The case-insensitive flare class (e.g., 'X3.2', 'm1.5', 'A9.6'),
+        or an array of flare classes.
 
     Returns
     -------
     flux : `~astropy.units.Quantity`
         X-ray flux between 1 and 8 Angstroms as measured near Earth in W/m^2.
+        This has the same shape as ``flareclass``.
 
     Raises
     ------
     TypeError
-        Input must be a string.
+        Input must be a string or an array of strings.
+    ValueError
+        If a flare class is not in the expected format.
 
     Examples
     --------
@@ -116,14 +276,43 @@ def flareclass_to_flux(flareclass):
     <Quantity 4.7e-06 W / m2>
     >>> flareclass_to_flux('X2.4')
     <Quantity 0.00024 W / m2>
+    >>> flareclass_to_flux(['M1', 'X2.4'])
+    <Quantity [1.0e-05, 2.4e-04] W / m2>
+    """
+    flareclass = np.asarray(flareclass)
+    if flareclass.dtype.kind != "U":
+        raise TypeError(f"Input must be a string or an array of strings, not {flareclass.dtype}")
+    flux, valid_letter, valid = _parse_flareclass(flareclass)
+    if not np.all(valid_letter):
+        raise ValueError(f"Flare class must start with one of {', '.join(_CLASS_LETTERS)}")
+    if not np.all(valid):
+        raise ValueError("Flare class must be a class letter followed by a number")
+    return flux
+
+
+def _parse_flareclass(flareclass):
+    """
+    Flux of an array of flare classes, along with whether the class letter and the
+    whole flare class are valid. The flux of an invalid flare class is NaN.
     """
-    if not isinstance(flareclass, str):
-        raise TypeError(f"Input must be a string, not {type(flareclass)}")
-    # TODO should probably make sure the string is in the expected format.
-    flareclass = flareclass.upper()
-    # invert the conversion dictionary
-    # conversion_dict = {v: k for k, v in GOES_CONVERSION_DICT.items()}
-    return float(flareclass[1:]) * GOES_CONVERSION_DICT[flareclass[0]]
+    flareclass = np.char.upper(flareclass)
+    letters = flareclass.astype("U1")
+    # The class letters are in alphabetical order, so can be found with a binary search.
+    index = np.clip(np.searchsorted(_CLASS_LETTERS, letters), 0, _CLASS_LETTERS.size - 1)
+    valid_letter = _CLASS_LETTERS[index] == letters
+    # Remove only the first character, by viewing each string as an array of characters.
+    n_characters = max(flareclass.dtype.itemsize // 4, 2)
+    flareclass = flareclass.astype(f"U{n_characters}")
+    characters = np.atleast_1d(flareclass).view("U1").reshape(flareclass.shape + (n_characters,))
+    subclass = np.ascontiguousarray(characters[..., 1:]).view(f"U{n_characters - 1}").reshape(flareclass.shape)
+    # The subclass must be a plain decimal number, e.g. "2" or "2.5"
+    if subclass.size:
+        valid_number = np.char.isdigit(np.char.replace(subclass, ".", "", count=1))
+    else:
+        valid_number = np.ones(subclass.shape, dtype=bool)
+    valid = valid_letter & valid_number
+    flux = np.where(valid, subclass, "nan").astype(float) * _CLASS_FLUX[index]
+    return flux, valid_letter, valid
 
 
 @u.quantity_input
@@ -135,12 +324,14 @@ def flux_to_flareclass(goesflux: u.watt / u.m**2):
     ----------
     flux : `~astropy.units.Quantity`
         X-ray flux between 1 and 8 Angstroms (usually measured by GOES) as
-        measured at the Earth in W/m^2
+        measured at the Earth in W/m^2. This can be a scalar or an array.
 
     Returns
     -------
-    flareclass : str
+    flareclass : str or `numpy.ndarray`
         The flare class e.g.: 'X3.2', 'M1.5', 'A9.6'.
+        If ``goesflux`` is an array, this is an array of flare classes with the same shape.
+        Fluxes that are NaN are given an empty string.
 
     Raises
     ------
@@ -165,21 +356,21 @@ def flux_to_flareclass(goesflux: u.watt / u.m**2):
     'A0.78'
     >>> flux_to_flareclass(0.00682 * u.watt/u.m**2)
     'X68.2'
+    >>> flux_to_flareclass([2.1e-05, 6.9e-07] * u.watt/u.m**2)
+    array(['M2.1', 'B6.9'], dtype='<U4')
     """
-
-    if goesflux.value < 0:
+    goesflux = goesflux.to_value("W/m**2")
+    if np.any(goesflux < 0):
         raise ValueError("Flux cannot be negative")
 
-    decade = np.floor(np.log10(goesflux.to("W/m**2").value))
-    # invert the conversion dictionary
-    conversion_dict = {v: k for k, v in GOES_CONVERSION_DICT.items()}
-    if decade < -8:
-        str_class = "A"
-        decade = -8
-    elif decade > -4:
-        str_class = "X"
-        decade = -4
-    else:
-        str_class = conversion_dict.get(u.Quantity(10**decade, "W/m**2"))
-    goes_subclass = 10**-decade * goesflux.to("W/m**2").value
-    return f"{str_class}{goes_subclass:.3g}"
+    # Fluxes below the A class or above the X class are given as a multiple of those classes.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        decade = np.floor(np.log10(goesflux))
+    valid = ~np.isnan(goesflux)
+    decade = np.clip(np.where(valid, decade, -8), -8, -4)
+    letters = _CLASS_LETTERS[decade.astype(int) + 8]
+    goes_subclass = 10**-decade * goesflux
+    flareclass = np.where(valid, np.char.add(letters, np.char.mod("%.3g", goes_subclass)), "")
+    if flareclass.ndim == 0:
+        return str(flareclass)
+    return flareclass
@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+
+import astropy.units as u
+from astropy.coordinates import SkyCoord
+from astropy.table import QTable
+from astropy.time import Time
+
+from sunpy.coordinates import Helioprojective, sun
+from sunpy.net import attrs
+from sunpy.time import TimeRange
+
+from sunkit_instruments.goes_xrs import GOESFlareCatalog, flareclass_to_flux
+
+
+class LocalHEKClient:
+    """
+    A stand-in for the HEK client which returns events from a fixed list.
+    """
+
+    def __init__(self, events):
+        self.events = events
+        self.queries = []
+
+    def search(self, *query):
+        time = next(attr for attr in query if isinstance(attr, attrs.Time))
+        self.queries.append((time.start, time.end))
+        return [
+            event
+            for event in self.events
+            if Time(event["event_endtime"]) >= time.start and Time(event["event_starttime"]) <= time.end
+        ]
+
+
+def make_event(event_id, start, peak, end, goes_class, noaa_active_region=0, event_coord=None):
+    if event_coord is None:
+        event_coord = SkyCoord(54 * u.deg, -21 * u.deg, frame="heliographic_stonyhurst", obstime=start)
+    return {
+        "kb_archivid": event_id,
+        "event_starttime": start,
+        "event_peaktime": peak,
+        "event_endtime": end,
+        "fl_goescls": goes_class,
+        "event_coord": event_coord,
+        "ar_noaanum": noaa_active_region,
+    }
+
+
+@pytest.fixture
+def client():
+    return LocalHEKClient(
+        [
+            make_event("ivo://1", "2011-06-07T06:16:00", "2011-06-07T06:41:00", "2011-06-07T06:59:00", "M2.5", 11226),
+            # The HEK masks missing values, such as flares without a NOAA active region
+            make_event(
+                "ivo://2",
+                "2011-06-07T12:00:00",
+                "2011-06-07T12:10:00",
+                "2011-06-07T12:20:00",
+                "C1.2",
+                noaa_active_region=np.ma.masked,
+            ),
+            # The HEK gives the locations of events in different coordinate frames
+            make_event(
+                "ivo://3",
+                "2011-06-08T03:00:00",
+                "2011-06-08T03:10:00",
+                "2011-06-08T03:20:00",
+                "B5",
+                event_coord=SkyCoord(
+                    0 * u.arcsec,
+                    0 * u.arcsec,
+                    frame=Helioprojective(observer="earth", obstime="2011-06-08T03:00:00"),
+                ),
+            ),
+            make_event("ivo://4", "2011-06-09T23:55:00", "2011-06-10T00:05:00", "2011-06-10T00:15:00", "X1.1"),
+            make_event(
+                "ivo://5",
+                "2011-06-10T05:00:00",
+                "2011-06-10T05:05:00",
+                "2011-06-10T05:10:00",
+                np.ma.masked,
+                noaa_active_region=np.ma.masked,
+                event_coord=np.ma.masked,
+            ),
+        ]
+    )
+
+
+def test_catalog_query(tmp_path, client):
+    catalog = GOESFlareCatalog(tmp_path / "flares.sqlite", client=client)
+    result = catalog.query(TimeRange("2011-06-07 00:00", "2011-06-08 00:00"))
+    assert isinstance(result, QTable)
+    assert list(result["event_id"]) == ["ivo://1", "ivo://2"]
+    assert isinstance(result["start_time"], Time)
+    assert result["event_date"][0] == "2011-06-07"
+    assert result["start_time"][0] == Time("2011-06-07T06:16:00")
+    assert result["peak_time"][0] == Time("2011-06-07T06:41:00")
+    assert result["end_time"][0] == Time("2011-06-07T06:59:00")
+    assert result["goes_class"][0] == "M2.5"
+    assert u.allclose(result["goes_flux"], flareclass_to_flux(["M2.5", "C1.2"]))
+    assert u.allclose(result["goes_location"][0], [54, -21] * u.deg)
+    assert result["noaa_active_region"][0] == 11226
+    assert list(result["noaa_active_region"].mask) == [False, True]
+    assert len(client.queries) == 1
+
+
+def test_catalog_caches_windows(tmp_path, client):
+    catalog = GOESFlareCatalog(tmp_path / "flares.sqlite", client=client)
+    catalog.query(TimeRange("2011-06-07 00:00", "2011-06-08 00:00"))
+    # Repeated and contained windows are answered from the catalog
+    catalog.query(TimeRange("2011-06-07 00:00", "2011-06-08 00:00"))
+    catalog.query(TimeRange("2011-06-07 06:00", "2011-06-07 12:00"))
+    assert len(client.queries) == 1
+    # Only the part of an overlapping window that is not in the catalog is retrieved
+    result = catalog.query(TimeRange("2011-06-07 12:00", "2011-06-10 12:00"))
+    assert len(client.queries) == 2
+    assert client.queries[-1] == (Time("2011-06-08 00:00"), Time("2011-06-10 12:00"))
+    assert list(result["event_id"]) == ["ivo://2", "ivo://3", "ivo://4", "ivo://5"]
+    assert np.isnan(result["goes_flux"][-1])
+    assert result["goes_class"][-1] == ""
+    assert np.all(np.isnan(result["goes_location"][-1]))
+    assert list(result["noaa_active_region"].mask) == [True, False, False, True]
+    # Locations in other frames are given as Stonyhurst heliographic coordinates
+    assert u.allclose(result["goes_location"][1], [0 * u.deg, sun.B0("2011-06-08T03:00:00")], atol=1e-6 * u.deg)
+    # The catalog persists on disk
+    catalog = GOESFlareCatalog(tmp_path / "flares.sqlite", client=client)
+    result = catalog.query(TimeRange("2011-06-07 00:00", "2011-06-10 12:00"))
+    assert len(client.queries) == 2
+    assert len(result) == 5
+    assert list(result["noaa_active_region"].mask) == [False, True, False, False, True]
+    assert np.all(np.isnan(result["goes_location"][-1]))
+
+
+def test_catalog_class_filter(tmp_path, client):
+    catalog = GOESFlareCatalog(tmp_path / "flares.sqlite", client=client)
+    result = catalog.query(TimeRange("2011-06-07 00:00", "2011-06-11 00:00"), goes_class_filter="C1.2")
+    assert list(result["goes_class"]) == ["M2.5", "C1.2", "X1.1"]
+    result = catalog.query(TimeRange("2011-06-07 00:00", "2011-06-11 00:00"), goes_class_filter="X1")
+    assert list(result["goes_class"]) == ["X1.1"]
+    # Flares exactly at the minimum class are included
+    result = catalog.query(TimeRange("2011-06-07 00:00", "2011-06-11 00:00"), goes_class_filter="M2.5")
+    assert list(result["goes_class"]) == ["M2.5", "X1.1"]
+    assert len(client.queries) == 1
+    result = catalog.query(TimeRange("2011-06-07 07:00", "2011-06-07 08:00"))
+    assert len(result) == 0
+    assert isinstance(result["start_time"], Time)
+
+
+@pytest.mark.remote_data
+def test_catalog_hek(tmp_path):
+    catalog = GOESFlareCatalog(tmp_path / "flares.sqlite")
+    result = catalog.query(TimeRange("2011-06-07 00:00", "2011-06-08 00:00"), goes_class_filter="M1")
+    assert result["event_date"][0] == "2011-06-07"
+    assert result["goes_class"][0] == "M2.5"
+    assert result["noaa_active_region"][0] == 11226
+    assert u.allclose(result["goes_location"][0], [54, -21] * u.deg)
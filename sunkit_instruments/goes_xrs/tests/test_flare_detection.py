@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+import astropy.units as u
+from astropy.table import QTable, vstack
+from astropy.time import Time
+
+from sunkit_instruments.goes_xrs import FlareDetector, detect_flares
+
+
+@pytest.fixture
+def xrs_data():
+    """
+    One day of 1 s flux with an M2 and a C5 flare on a B1 background.
+    """
+    times = np.datetime64("2017-09-10T00:00:00", "ns") + np.arange(86400).astype("timedelta64[s]")
+    seconds = np.arange(86400)
+    flux = np.full(seconds.shape, 1e-7)
+    for peak, amplitude in [(6 * 3600, 2e-5), (15 * 3600, 5e-6)]:
+        dt = seconds - peak
+        flux += amplitude * np.where(dt < 0, np.exp(-((dt / 600) ** 2)), np.exp(-dt / 900))
+    flux[1000:1100] = np.nan
+    return times, flux * u.W / u.m**2
+
+
+def test_detect_flares(xrs_data):
+    times, flux = xrs_data
+    flares = detect_flares(times, flux)
+    assert isinstance(flares, QTable)
+    assert len(flares) == 2
+    assert_array_equal(flares["goes_class"], ["M2", "C5.08"])
+    assert u.allclose(flares["goes_flux"], [2e-5, 5.1e-6] * u.W / u.m**2, rtol=0.01)
+    assert u.allclose(flares["background_flux"], 1e-7 * u.W / u.m**2, rtol=0.01)
+    # The peak is the minute with the maximum average flux, which is the minute
+    # before the peak as the flux changes faster just after the peak than just before it
+    assert flares["peak_time"][0] == Time("2017-09-10T05:59:00")
+    assert flares["start_time"][0] < flares["peak_time"][0] < flares["end_time"][0]
+    # The end is when the flux has decayed halfway to the background, after ~ln(2) e-folding times
+    decay = (flares["end_time"] - flares["peak_time"]).to(u.min)
+    assert u.allclose(decay, 15 * np.log(2) * u.min, atol=1.5 * u.min)
+    # Times can also be given as Time
+    assert_array_equal(detect_flares(Time(times), flux)["start_time"], flares["start_time"])
+
+
+def test_detect_flares_unfinished(xrs_data):
+    times, flux = xrs_data
+    # Stop the observations during the decay of the second flare
+    flares = detect_flares(times[: 15 * 3600 + 60], flux[: 15 * 3600 + 60])
+    assert_array_equal(flares["goes_class"], ["M2"])
+    flares = detect_flares(times[:3600], flux[:3600])
+    assert len(flares) == 0
+    assert isinstance(flares["start_time"], Time)
+
+
+def test_flare_detector_stream(xrs_data):
+    times, flux = xrs_data
+    expected = detect_flares(times, flux)
+    detector = FlareDetector()
+    edges = np.r_[0, np.sort(np.random.default_rng(0).choice(times.size, 200, replace=False)), times.size]
+    flares = vstack([detector.update(times[i:j], flux[i:j]) for i, j in zip(edges[:-1], edges[1:])])
+    assert_array_equal(flares["start_time"], expected["start_time"])
+    assert_array_equal(flares["peak_time"], expected["peak_time"])
+    assert_array_equal(flares["end_time"], expected["end_time"])
+    assert_array_equal(flares["goes_class"], expected["goes_class"])
+    # Only the most recent observations are kept
+    assert len(detector._buffer) < 2 * 3600
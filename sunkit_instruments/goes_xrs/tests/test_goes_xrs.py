@@ -1,9 +1,12 @@
 import numpy as np
+import pandas as pd
 import pytest
 from numpy.testing import assert_almost_equal, assert_array_equal
 from scipy.io import readsav
 
 import astropy.units as u
+from astropy.coordinates import SkyCoord
+from astropy.table import QTable
 from astropy.time import Time
 from astropy.units.quantity import Quantity
 
@@ -13,6 +16,15 @@ from sunpy.util.exceptions import SunpyUserWarning
 
 from sunkit_instruments import goes_xrs as goes
 from sunkit_instruments.data.test import get_test_filepath
+from sunkit_instruments.goes_xrs.goes_chianti_tem import (
+    LOOKUP_RTOL,
+    _get_response_lookup,
+    _get_response_splines,
+    _get_response_table,
+    _goesr_detector_index,
+    _rolling_background,
+)
+from sunkit_instruments.goes_xrs.goes_xrs import _hek_event_table, _stonyhurst_locations
 
 # Tests for the GOES temperature and emission measure calculations
 goes15_fits_filepath = get_test_filepath("go1520110607.fits")  # test old FITS files
@@ -105,6 +117,319 @@ def test_satellite_number_supported():
         goes.calculate_temperature_em(goeslc)
 
 
+@pytest.mark.remote_data
+def test_stream_temperature_em(tmp_path):
+    import h5py
+
+    goeslc = timeseries.TimeSeries(goes16_filepath_nc)
+    goes_temp_em = goes.calculate_temperature_em(goeslc)
+    n_half = len(goeslc.time) // 2
+    chunks = [goes16_filepath_nc, goeslc.truncate(0, n_half), goeslc.truncate(n_half, len(goeslc.time))]
+    output = tmp_path / "temp_em.h5"
+    results = list(goes.stream_temperature_em(chunks, output=output))
+    assert len(results) == 3
+    assert all(isinstance(result, timeseries.GenericTimeSeries) for result in results)
+    assert np.all(results[0].time == goes_temp_em.time)
+    with h5py.File(output) as f:
+        assert f["temperature"].shape == (2 * len(goeslc.time),)
+        assert f["temperature"].attrs["unit"] == "MK"
+        np.testing.assert_allclose(
+            f["temperature"][len(goeslc.time):],
+            goes_temp_em._data["temperature"].values,
+        )
+
+
+@pytest.mark.remote_data
+def test_calculate_temperature_em_batch(tmp_path):
+    files = [goes15_filepath_nc, goes16_filepath_nc, tmp_path / "missing.nc"]
+    results = goes.calculate_temperature_em_batch(files, max_workers=2)
+    assert [result["file"] for result in results] == files
+    for filename, result in zip(files[:2], results[:2]):
+        assert result["error"] is None
+        assert result["elapsed"].unit == u.s
+        expected = goes.calculate_temperature_em(timeseries.TimeSeries(filename))
+        assert_array_equal(result["result"].quantity("temperature"), expected.quantity("temperature"))
+    assert results[2]["result"] is None
+    assert results[2]["error"] is not None
+
+    results = goes.calculate_temperature_em_batch(files[:2], output_dir=tmp_path / "output")
+    assert all(result["result"] is None for result in results)
+    assert all(result["output"].exists() for result in results)
+
+
+def test_calculate_temperature_em_batch_response_error(monkeypatch, tmp_path):
+    # An error getting the response table is raised before any process is started
+    def get_response_table():
+        raise OSError("Failed to download the response table")
+
+    monkeypatch.setattr("sunkit_instruments.goes_xrs.goes_chianti_tem._get_response_table", get_response_table)
+    with pytest.raises(OSError, match="Failed to download the response table"):
+        goes.calculate_temperature_em_batch([tmp_path / "missing.nc"], max_workers=1)
+
+
+@pytest.mark.parametrize("goes_files", [goes15_filepath_nc, goes16_filepath_nc])
+@pytest.mark.remote_data
+def test_calculate_temperature_em_from_flux(goes_files):
+    goeslc = timeseries.TimeSeries(goes_files)
+    goes_temp_em = goes.calculate_temperature_em(goeslc)
+    data = goeslc.to_dataframe()
+    extra_columns = {
+        name: data[name].values
+        for name in ["xrsa_quality", "xrsb_quality", "xrsa_primary_chan", "xrsb_primary_chan"]
+        if name in goeslc.columns
+    }
+    temperature, emission_measure = goes.calculate_temperature_em_from_flux(
+        goeslc.quantity("xrsa"),
+        goeslc.quantity("xrsb"),
+        int(goeslc.observatory.split("-")[-1]),
+        goeslc.time[0],
+        **extra_columns,
+    )
+    assert temperature.unit == u.MK
+    assert emission_measure.unit == u.cm**-3
+    np.testing.assert_allclose(temperature.value, goes_temp_em._data["temperature"].values)
+    np.testing.assert_allclose(emission_measure.value, goes_temp_em._data["emission_measure"].values)
+    with pytest.raises(ValueError, match="GOES satellite number has to be between 1 and 19"):
+        goes.calculate_temperature_em_from_flux(goeslc.quantity("xrsa"), goeslc.quantity("xrsb"), 21, goeslc.time[0])
+
+
+@pytest.mark.parametrize("satellite_number", [15, 16])
+@pytest.mark.remote_data
+def test_temperature_em_uncertainty(satellite_number):
+    xrsa = [1e-7, 2e-6, 5e-6] * u.W / u.m**2
+    xrsb = [1e-6, 1e-5, 2e-5] * u.W / u.m**2
+    temperature, emission_measure, temperature_err, emission_measure_err = (
+        goes.calculate_temperature_em_from_flux(
+            xrsa,
+            xrsb,
+            satellite_number,
+            "2017-09-10",
+            xrsa_uncertainty=0.01 * xrsa,
+            xrsb_uncertainty=0.02 * xrsb,
+        )
+    )
+    # Compare with the uncertainties estimated from finite differences
+    step = 1e-6
+    temperature_a, emission_measure_a = goes.calculate_temperature_em_from_flux(
+        xrsa * (1 + step), xrsb, satellite_number, "2017-09-10"
+    )
+    temperature_b, emission_measure_b = goes.calculate_temperature_em_from_flux(
+        xrsa, xrsb * (1 + step), satellite_number, "2017-09-10"
+    )
+    expected_temperature_err = np.hypot(
+        0.01 * (temperature_a - temperature) / step, 0.02 * (temperature_b - temperature) / step
+    )
+    expected_emission_measure_err = np.hypot(
+        0.01 * (emission_measure_a - emission_measure) / step,
+        0.02 * (emission_measure_b - emission_measure) / step,
+    )
+    assert u.allclose(temperature_err, expected_temperature_err, rtol=1e-4)
+    assert u.allclose(emission_measure_err, expected_emission_measure_err, rtol=1e-4)
+
+    goeslc = timeseries.TimeSeries(goes16_filepath_nc)
+    goes_temp_em = goes.calculate_temperature_em(goeslc, xrsb_uncertainty=0.02 * goeslc.quantity("xrsb"))
+    assert goes_temp_em.units["temperature_uncertainty"] == u.MK
+    assert goes_temp_em.units["emission_measure_uncertainty"] == u.cm**-3
+    assert_array_equal(
+        goes_temp_em.quantity("temperature"), goes.calculate_temperature_em(goeslc).quantity("temperature")
+    )
+
+
+@pytest.mark.remote_data
+def test_calculate_temperature_em_merged():
+    goes15 = timeseries.TimeSeries(goes15_filepath_nc)
+    goes16 = timeseries.TimeSeries(goes16_filepath_nc)
+    merged = goes.calculate_temperature_em_merged([goes16, goes15])
+    assert isinstance(merged, timeseries.GenericTimeSeries)
+    assert merged.units["temperature"] == u.MK
+    data = merged.to_dataframe()
+    # The cadence of the GOES-15 data is used, and GOES-16 is preferred where it has good data
+    assert np.all(np.diff(data.index) == np.median(np.diff(goes15._data.index)))
+    assert set(np.unique(data["satellite"])) <= {0, 15, 16}
+    assert np.sum(data["satellite"] == 16) > np.sum(data["satellite"] == 15)
+    assert np.all(np.isfinite(data["temperature"][data["satellite"] != 0]))
+
+    # A single satellite at its own cadence gives the same result as calculate_temperature_em
+    merged = goes.calculate_temperature_em_merged([goes16], cadence=1 * u.s).to_dataframe()
+    expected = goes.calculate_temperature_em(goes16).to_dataframe()
+    expected.index = expected.index.floor("1s")
+    expected = expected.reindex(merged.index)
+    np.testing.assert_allclose(merged["temperature"], expected["temperature"])
+    np.testing.assert_allclose(merged["emission_measure"], expected["emission_measure"])
+
+    with pytest.raises(ValueError, match="At least one GOES/XRS timeseries must be given"):
+        goes.calculate_temperature_em_merged([])
+
+    # The cadence cannot be found from a single sample
+    with pytest.raises(ValueError, match="The cadence must be given"):
+        goes.calculate_temperature_em_merged([goes16, goes15.truncate(0, 1)])
+    merged = goes.calculate_temperature_em_merged([goes15.truncate(0, 1)], cadence=2 * u.s)
+    assert len(merged.to_dataframe()) == 1
+
+
+@pytest.mark.parametrize("goes_files", [goes15_filepath_nc, goes16_filepath_nc])
+@pytest.mark.remote_data
+def test_temperature_em_updater(goes_files):
+    goeslc = timeseries.TimeSeries(goes_files)
+    goes_temp_em = goes.calculate_temperature_em(goeslc)
+    data = goeslc.to_dataframe()
+    extra_columns = [
+        name
+        for name in ["xrsa_quality", "xrsb_quality", "xrsa_primary_chan", "xrsb_primary_chan"]
+        if name in goeslc.columns
+    ]
+    updater = goes.TemperatureEMUpdater(int(goeslc.observatory.split("-")[-1]), buffer_size=1000)
+    edges = np.r_[0, np.sort(np.random.default_rng(0).choice(len(data), 50, replace=False)), len(data)]
+    temperature = []
+    for i, j in zip(edges[:-1], edges[1:]):
+        chunk = data.iloc[i:j]
+        temperature_chunk, emission_measure_chunk = updater.update(
+            chunk.index,
+            chunk["xrsa"].to_numpy() * u.W / u.m**2,
+            chunk["xrsb"].to_numpy() * u.W / u.m**2,
+            **{name: chunk[name].to_numpy() for name in extra_columns},
+        )
+        assert temperature_chunk.unit == u.MK
+        assert emission_measure_chunk.unit == u.cm**-3
+        temperature.append(temperature_chunk.value)
+    np.testing.assert_allclose(np.concatenate(temperature), goes_temp_em._data["temperature"].values)
+
+    # Only the most recent results are kept
+    assert len(updater) == 1000
+    buffered = updater.to_timeseries()
+    assert np.all(buffered.time == goes_temp_em.time[-1000:])
+    np.testing.assert_allclose(
+        buffered._data["emission_measure"].values, goes_temp_em._data["emission_measure"].values[-1000:]
+    )
+
+
+@pytest.mark.remote_data
+def test_temperature_em_updater_errors():
+    with pytest.raises(ValueError, match="GOES satellite number has to be between 1 and 19"):
+        goes.TemperatureEMUpdater(21)
+    with pytest.raises(ValueError, match="The buffer size must be at least 1"):
+        goes.TemperatureEMUpdater(16, buffer_size=0)
+    updater = goes.TemperatureEMUpdater(16)
+    temperature, emission_measure = updater.update(np.array([], dtype="datetime64[ns]"), [] * u.W / u.m**2, [] * u.W / u.m**2)
+    assert temperature.size == emission_measure.size == len(updater) == 0
+    # Without the primary detectors, these are assumed and a warning is emitted once
+    xrs = [1e-6] * u.W / u.m**2
+    with pytest.warns(SunpyUserWarning, match="assuming primary for all"):
+        updater.update(np.array(["2017-09-10T00:00:00"], dtype="datetime64[ns]"), xrs / 10, xrs)
+    updater.update(np.array(["2017-09-10T00:00:01"], dtype="datetime64[ns]"), xrs / 10, xrs)
+    assert len(updater) == 2
+
+
+@pytest.mark.parametrize("satellite_number", [15, 16])
+@pytest.mark.remote_data
+def test_temperature_em_fast(satellite_number):
+    rng = np.random.default_rng(0)
+    xrsb = 10 ** rng.uniform(-8, -3, 100000) * u.W / u.m**2
+    xrsa = xrsb * 10 ** rng.uniform(-3, 0, xrsb.size)
+    temperature, emission_measure = goes.calculate_temperature_em_from_flux(
+        xrsa, xrsb, satellite_number, "2017-09-10"
+    )
+    temperature_fast, emission_measure_fast = goes.calculate_temperature_em_from_flux(
+        xrsa, xrsb, satellite_number, "2017-09-10", fast=True
+    )
+    assert u.allclose(temperature_fast, temperature, rtol=LOOKUP_RTOL)
+    assert u.allclose(emission_measure_fast, emission_measure, rtol=LOOKUP_RTOL)
+
+    goeslc = timeseries.TimeSeries(goes16_filepath_nc)
+    goes_temp_em = goes.calculate_temperature_em(goeslc)
+    goes_temp_em_fast = goes.calculate_temperature_em(goeslc, fast=True)
+    for column in ["temperature", "emission_measure"]:
+        assert u.allclose(
+            goes_temp_em_fast.quantity(column), goes_temp_em.quantity(column), rtol=LOOKUP_RTOL, equal_nan=True
+        )
+
+
+@pytest.mark.remote_data
+def test_temperature_em_fast_tolerance_unmet(monkeypatch):
+    # If the lookup table cannot meet the tolerance, the splines are used instead
+    monkeypatch.setattr("sunkit_instruments.goes_xrs.goes_chianti_tem.LOOKUP_RTOL", 0)
+    monkeypatch.setattr("sunkit_instruments.goes_xrs.goes_chianti_tem._MAX_LOOKUP_SIZE", 1024)
+    xrsb = [1e-6, 1e-5, 1e-4] * u.W / u.m**2
+    xrsa = xrsb / 10
+    _get_response_lookup.cache_clear()
+    try:
+        with pytest.warns(SunpyUserWarning, match="so the splines are used instead"):
+            temperature_fast, emission_measure_fast = goes.calculate_temperature_em_from_flux(
+                xrsa, xrsb, 15, "2017-09-10", fast=True
+            )
+    finally:
+        _get_response_lookup.cache_clear()
+    temperature, emission_measure = goes.calculate_temperature_em_from_flux(xrsa, xrsb, 15, "2017-09-10")
+    assert_array_equal(temperature_fast, temperature)
+    assert_array_equal(emission_measure_fast, emission_measure)
+
+
+@pytest.mark.remote_data
+def test_response_splines_cached():
+    goeslc = timeseries.TimeSeries(goes16_filepath_nc)
+    _get_response_splines.cache_clear()
+    goes.calculate_temperature_em(goeslc)
+    n_splines = _get_response_splines.cache_info().currsize
+    assert n_splines > 0
+    goes.calculate_temperature_em(goeslc)
+    assert _get_response_splines.cache_info().currsize == n_splines
+    assert _get_response_splines.cache_info().hits >= n_splines
+    assert _get_response_table.cache_info().currsize == 1
+
+
+@pytest.mark.remote_data
+def test_calculate_temperature_em_background():
+    goeslc = timeseries.TimeSeries(goes16_filepath_nc)
+    goes_temp_em = goes.calculate_temperature_em(goeslc, background_window=10 * u.min)
+    data = goeslc.to_dataframe()
+    flux = {}
+    for channel in ["xrsa", "xrsb"]:
+        good = data[channel].where(data[f"{channel}_quality"] == 0)
+        flux[channel] = (data[channel] - good.rolling("600s", min_periods=1).min()).to_numpy() * u.W / u.m**2
+    temperature, emission_measure = goes.calculate_temperature_em_from_flux(
+        flux["xrsa"],
+        flux["xrsb"],
+        16,
+        goeslc.time[0],
+        **{name: data[name].to_numpy() for name in ["xrsa_quality", "xrsb_quality", "xrsa_primary_chan", "xrsb_primary_chan"]},
+    )
+    assert u.allclose(goes_temp_em.quantity("temperature"), temperature, equal_nan=True)
+    assert u.allclose(goes_temp_em.quantity("emission_measure"), emission_measure, equal_nan=True)
+    # There is no emission measure above the background when the flux is at its rolling minimum
+    at_background = flux["xrsb"] == 0
+    assert at_background.any()
+    assert np.all(goes_temp_em.quantity("emission_measure")[at_background] == 0)
+
+    with pytest.raises(ValueError, match="The background percentile must be between 0 and 100"):
+        goes.calculate_temperature_em(goeslc, background_window=10 * u.min, background_percentile=150)
+
+
+def test_rolling_background():
+    times = pd.date_range("2017-09-10", periods=200, freq="1s")
+    flux = np.random.default_rng(0).uniform(1e-7, 1e-6, times.size)
+    flux[50:60] = np.nan
+    quality = np.zeros(times.size, dtype=int)
+    quality[100] = 1
+    good_flux = np.where(quality == 0, flux, np.nan)
+    for percentile in [0, 10, 50]:
+        background = _rolling_background(times, flux, 20 * u.s, percentile, quality=quality)
+        # The window is the 20 s up to and including each time
+        expected = [np.nanpercentile(good_flux[max(i - 19, 0) : i + 1], percentile) for i in range(times.size)]
+        assert_almost_equal(background / 1e-7, np.array(expected) / 1e-7)
+
+
+def test_goesr_detector_index():
+    xrsa_primary_chan = np.array([1, 2, 1, 2, 0, 1])
+    xrsb_primary_chan = np.array([1, 1, 2, 2, 1, 3])
+    assert_array_equal(
+        _goesr_detector_index(xrsa_primary_chan, xrsb_primary_chan), [0, 1, 2, 3, -1, -1]
+    )
+    # Missing primary channels are given as NaN
+    xrsa_primary_chan = np.array([1, np.nan, 2, np.inf])
+    xrsb_primary_chan = np.array([2, 1, np.nan, 1])
+    assert_array_equal(_goesr_detector_index(xrsa_primary_chan, xrsb_primary_chan), [2, -1, -1, -1])
+
+
 # We also test against the IDL outputs for the GOES-15 and 16 test files
 idl_chianti_tem_15 = get_test_filepath("goes_15_test_chianti_tem_idl.sav")
 idl_chianti_tem_16 = get_test_filepath("goes_16_test_chianti_tem_idl.sav")
@@ -209,6 +534,124 @@ def test_goes_event_list():
     assert result[0]["noaa_active_region"] == 11226
 
 
+@pytest.mark.remote_data
+def test_goes_event_list_table():
+    trange = TimeRange("2011-06-07 00:00", "2011-06-08 00:00")
+    result = goes.get_goes_event_list(trange, goes_class_filter="M1", as_table=True)
+    result_list = goes.get_goes_event_list(trange, goes_class_filter="M1")
+    assert isinstance(result, QTable)
+    assert len(result) == len(result_list)
+    assert isinstance(result["start_time"], Time)
+    assert result["event_date"][0] == "2011-06-07"
+    assert u.allclose(result["goes_location"][0], [54, -21] * u.deg)
+    assert is_time_equal(result["start_time"][0], parse_time((2011, 6, 7, 6, 16)))
+    assert is_time_equal(result["peak_time"][0], parse_time((2011, 6, 7, 6, 41)))
+    assert is_time_equal(result["end_time"][0], parse_time((2011, 6, 7, 6, 59)))
+    assert result["goes_class"][0] == "M2.5"
+    assert u.allclose(result["goes_flux"][0], 2.5e-5 * u.W / u.m**2)
+    assert result["noaa_active_region"][0] == 11226
+
+
+def test_goes_event_list_table_masked(monkeypatch):
+    from sunpy.net import hek
+
+    events = [
+        {
+            "kb_archivid": f"ivo://{i}",
+            "event_starttime": f"2011-06-07T0{i}:00:00",
+            "event_peaktime": f"2011-06-07T0{i}:10:00",
+            "event_endtime": f"2011-06-07T0{i}:20:00",
+            "fl_goescls": goes_class,
+            "event_coord": SkyCoord(54 * u.deg, -21 * u.deg, frame="heliographic_stonyhurst", obstime="2011-06-07"),
+            "ar_noaanum": noaa_active_region,
+        }
+        for i, (goes_class, noaa_active_region) in enumerate(
+            [
+                ("M2.5", 11226),
+                ("C1.2", np.ma.masked),
+                ("M1", np.ma.masked),
+                (np.ma.masked, np.ma.masked),
+                ("MX1", np.ma.masked),
+            ]
+        )
+    ]
+
+    class LocalHEKClient:
+        def search(self, *query):
+            self.query = query
+            return events
+
+    client = LocalHEKClient()
+    monkeypatch.setattr(hek, "HEKClient", lambda: client)
+    trange = TimeRange("2011-06-07 00:00", "2011-06-08 00:00")
+    result = goes.get_goes_event_list(trange, as_table=True)
+    assert_array_equal(result["event_id"], [f"ivo://{i}" for i in range(5)])
+    assert_array_equal(result["goes_class"], ["M2.5", "C1.2", "M1", "", "MX1"])
+    assert_array_equal(np.isnan(result["goes_flux"]), [False, False, False, True, True])
+    assert_array_equal(result["noaa_active_region"].mask, [False, True, True, True, True])
+    assert result["noaa_active_region"][0] == 11226
+    # Flares exactly at the minimum class are included, and those without a valid class are not
+    result = goes.get_goes_event_list(trange, goes_class_filter="M1", as_table=True)
+    assert_array_equal(result["goes_class"], ["M2.5", "M1"])
+    assert any(getattr(attr, "operator", None) == ">=" for attr in client.query)
+    assert [event["goes_class"] for event in goes.get_goes_event_list(trange, goes_class_filter="M1")] == ["M2.5", "M1"]
+
+
+def test_hek_event_table():
+    events = [
+        {
+            "kb_archivid": f"ivo://{i}",
+            "event_starttime": f"2011-06-07T0{i}:00:00",
+            "event_peaktime": f"2011-06-07T0{i}:10:00",
+            "event_endtime": f"2011-06-07T0{i}:20:00",
+            "fl_goescls": goes_class,
+            "event_coord": SkyCoord(10 * i * u.deg, -21 * u.deg, frame="heliographic_stonyhurst"),
+            "ar_noaanum": 11226,
+        }
+        for i, goes_class in enumerate(["M2.5", "c1", ""])
+    ]
+    # Missing values are masked by the HEK
+    events[2].update(fl_goescls=np.ma.masked, event_coord=np.ma.masked, ar_noaanum=np.ma.masked)
+    table = _hek_event_table(events)
+    assert_array_equal(table["event_date"], ["2011-06-07"] * 3)
+    assert_array_equal(table["start_time"].isot, [f"2011-06-07T0{i}:00:00.000" for i in range(3)])
+    assert_array_equal(table["goes_class"], ["M2.5", "c1", ""])
+    assert u.allclose(table["goes_flux"][:2], [2.5e-5, 1e-6] * u.W / u.m**2)
+    assert np.isnan(table["goes_flux"][2])
+    assert u.allclose(table["goes_location"][:2, 0], [0, 10] * u.deg)
+    assert np.all(np.isnan(table["goes_location"][2]))
+    assert_array_equal(table["noaa_active_region"].mask, [False, False, True])
+    assert len(_hek_event_table([])) == 0
+
+
+def test_stonyhurst_locations():
+    from sunpy.coordinates import (
+        HeliographicCarrington,
+        HeliographicStonyhurst,
+        Helioprojective,
+        get_earth,
+    )
+
+    obstime = parse_time("2011-06-07") + np.arange(6) * u.day
+    frames = [
+        lambda t: HeliographicStonyhurst(obstime=t),
+        lambda t: Helioprojective(obstime=t, observer=get_earth(t)),
+        lambda t: HeliographicCarrington(obstime=t, observer=get_earth(t)),
+    ]
+    # Events in different frames at different times are transformed in groups
+    event_coords = [
+        SkyCoord(10 * i * u.deg, -21 * u.deg, frame=frames[i % 3](t))
+        if i % 3 != 1
+        else SkyCoord(100 * i * u.arcsec, -200 * u.arcsec, frame=frames[1](t))
+        for i, t in enumerate(obstime)
+    ]
+    locations = _stonyhurst_locations([*event_coords, np.ma.masked])
+    for location, event_coord in zip(locations, event_coords):
+        expected = event_coord.transform_to(HeliographicStonyhurst(obstime=event_coord.obstime))
+        assert u.allclose(location, u.Quantity([expected.lon, expected.lat]), atol=1e-8 * u.deg)
+    assert np.all(np.isnan(locations[-1]))
+
+
 def test_flux_to_classletter():
     """
     Test converting fluxes into a class letter.
@@ -244,4 +687,33 @@ def test_joint_class_to_flux():
         assert c == goes.flux_to_flareclass(goes.flareclass_to_flux(c))
 
 
+def test_flareclass_arrays():
+    classes = np.array([["A3.49", "a0.23", "M1", "x2.3"], ["M5.8", "C2.3", "B3.45", "X20"]])
+    fluxes = goes.flareclass_to_flux(classes)
+    assert fluxes.shape == classes.shape
+    expected = [goes.flareclass_to_flux(c).value for c in classes.ravel()]
+    assert_almost_equal(fluxes.value.ravel(), expected)
+    calculated_classes = goes.flux_to_flareclass(fluxes)
+    assert isinstance(calculated_classes, np.ndarray)
+    assert_array_equal(calculated_classes, np.char.upper(classes))
+    assert_array_equal(
+        goes.flux_to_flareclass([0, np.nan, 1e-9, 1e-2] * u.W / u.m**2), ["A0", "", "A0.1", "X100"]
+    )
+    assert isinstance(goes.flareclass_to_flux(["M1"]), Quantity)
+    with pytest.raises(ValueError, match="Flux cannot be negative"):
+        goes.flux_to_flareclass([1e-6, -1e-6] * u.W / u.m**2)
+    with pytest.raises(ValueError, match="Flare class must start with one of"):
+        goes.flareclass_to_flux(["M1", "Z1"])
+    with pytest.raises(ValueError, match="Flare class must be a class letter followed by a number"):
+        goes.flareclass_to_flux(["M1", "M"])
+    with pytest.raises(TypeError, match="Input must be a string or an array of strings"):
+        goes.flareclass_to_flux(1e-5)
+
+
+@pytest.mark.parametrize("flareclass", ["MX1", "XX5", "MM2", "mm2", "M", "M1e3", "M-1", "Mnan", "M 1", "M1.2.3", ["M1", "MX1"]])
+def test_flareclass_to_flux_invalid(flareclass):
+    with pytest.raises(ValueError, match="Flare class must be a class letter followed by a number"):
+        goes.flareclass_to_flux(flareclass)
+
+
 # TODO add a test to check for raising error
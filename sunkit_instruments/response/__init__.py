@@ -2,4 +2,4 @@
 A subpackage for computing instrument responses
 """
 
-from sunkit_instruments.response.thermal import SourceSpectra, get_temperature_response
+from sunkit_instruments.response.thermal import ResponseTable, SourceSpectra, get_temperature_response
@@ -1,8 +1,13 @@
 """This module defines abstractions for computing instrument response."""
 import abc
+import functools
+
+import numpy as np
 
 import astropy.units as u
 
+from sunpy.time import parse_time
+
 __all__ = ["AbstractChannel"]
 
 
@@ -12,6 +17,16 @@ class AbstractChannel(abc.ABC):
 
     For all methods and properties defined here, see the
     topic guide on instrument response for more information.
+
+    The products of the time-independent properties needed for the
+    wavelength response (`geometrical_area`, `mirror_reflectance`,
+    `filter_transmittance`, `effective_quantum_efficiency`, `wavelength`,
+    `camera_gain`, `energy_per_electron` and `pixel_solid_angle`) are
+    computed the first time they are needed and cached on the channel.
+    The cache is not updated if any of these properties change afterwards,
+    e.g. if an attribute they depend on is reassigned, in which case
+    `wavelength_response` and `effective_area` return stale values until
+    `clear_cache` is called. Only `degradation` is evaluated every time.
     """
 
     @u.quantity_input
@@ -29,16 +44,17 @@ class AbstractChannel(abc.ABC):
         ----------
         obstime: any format parsed by `~sunpy.time.parse_time`, optional
             If specified, this is used to compute the time-dependent
-            instrument degradation.
+            instrument degradation. If this is an array of times, the
+            first axis of the wavelength response corresponds to time.
+
+        Notes
+        -----
+        The time-independent part of the wavelength response is cached
+        (see `AbstractChannel`). Call `clear_cache` if the properties of the
+        channel change.
         """
         area_eff = self.effective_area(obstime=obstime)
-        return (
-            area_eff
-            * self.energy_per_photon
-            * self.pixel_solid_angle
-            * self.camera_gain
-            / self.energy_per_electron
-        )
+        return area_eff * self._wavelength_response_factor
 
     @u.quantity_input
     def effective_area(self, obstime=None) -> u.cm**2:
@@ -53,15 +69,72 @@ class AbstractChannel(abc.ABC):
         ----------
         obstime: any format parsed by `sunpy.time.parse_time`, optional
             If specified, this is used to compute the time-dependent
-            instrument degradation.
+            instrument degradation. If this is an array of times, the
+            first axis of the effective area corresponds to time.
+
+        Notes
+        -----
+        The time-independent part of the effective area is cached
+        (see `AbstractChannel`). Call `clear_cache` if the properties of the
+        channel change.
+        """
+        return self._undegraded_effective_area * self._broadcast_degradation(obstime)
+
+    def clear_cache(self):
+        """
+        Clear the cached time-independent parts of the response.
+        """
+        for name in ["_undegraded_effective_area", "_wavelength_response_factor"]:
+            self.__dict__.pop(name, None)
+
+    @functools.cached_property
+    def _undegraded_effective_area(self):
+        """
+        Effective area excluding the time-dependent instrument degradation.
         """
         return (
             self.geometrical_area
             * self.mirror_reflectance
             * self.filter_transmittance
             * self.effective_quantum_efficiency
-            * self.degradation(obstime=obstime)
-        )
+        ).to("cm2")
+
+    @functools.cached_property
+    def _wavelength_response_factor(self):
+        """
+        Conversion from effective area to wavelength response.
+        """
+        return (
+            self.energy_per_photon
+            * self.pixel_solid_angle
+            * self.camera_gain
+            / self.energy_per_electron
+        ).to("DN sr / (photon pix)")
+
+    def _broadcast_degradation(self, obstime):
+        """
+        Degradation with a leading time axis if ``obstime`` is an array of times.
+
+        `degradation` is only called once for all times. For an array of times,
+        a degradation with as many dimensions as ``obstime`` depends only on time,
+        and is broadcast over wavelength. Otherwise, it must have as many dimensions
+        as ``obstime.shape + wavelength.shape``.
+        """
+        degradation = u.Quantity(self.degradation(obstime=obstime), u.dimensionless_unscaled)
+        if obstime is None:
+            return degradation
+        obstime = parse_time(obstime)
+        if obstime.isscalar:
+            return degradation
+        shape = obstime.shape + self.wavelength.shape
+        if degradation.ndim == obstime.ndim:
+            degradation = degradation.reshape(degradation.shape + (1,) * self.wavelength.ndim)
+        elif degradation.ndim not in (0, len(shape)):
+            raise ValueError(
+                f"The degradation must have shape {obstime.shape} or {shape} "
+                f"for an array of observation times, not {degradation.shape}."
+            )
+        return np.broadcast_to(degradation, shape, subok=True)
 
     @property
     @u.quantity_input
@@ -70,7 +143,14 @@ class AbstractChannel(abc.ABC):
 
     @abc.abstractmethod
     @u.quantity_input
-    def degradation(self, obstime=None) -> u.dimensionless_unscaled: ...
+    def degradation(self, obstime=None) -> u.dimensionless_unscaled:
+        """
+        Time-dependent instrument degradation.
+
+        If ``obstime`` is an array of times, this should return either an
+        array with the same shape as ``obstime`` or an array with shape
+        ``obstime.shape + wavelength.shape``.
+        """
 
     @property
     @abc.abstractmethod
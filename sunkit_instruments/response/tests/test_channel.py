@@ -3,7 +3,9 @@ import pytest
 
 import astropy.units as u
 
-from sunkit_instruments.response import SourceSpectra
+from sunpy.time import parse_time
+
+from sunkit_instruments.response import ResponseTable, SourceSpectra, get_temperature_response
 from sunkit_instruments.response.abstractions import AbstractChannel
 
 
@@ -57,6 +59,15 @@ class TestChannel(AbstractChannel):
         return (1 * u.arcsec) ** 2 / u.pixel
 
 
+class DegradingTestChannel(TestChannel):
+    @u.quantity_input
+    def degradation(self, obstime=None) -> u.dimensionless_unscaled:
+        if obstime is None:
+            return 1.0
+        elapsed = (parse_time(obstime) - parse_time('2010-01-01')).to_value('yr')
+        return np.exp(-elapsed[..., np.newaxis] * self.wavelength.to_value('AA') / 1e3)
+
+
 @pytest.fixture
 def fake_channel():
     return TestChannel()
@@ -70,6 +81,53 @@ def test_wavelength_response(fake_channel):
     assert isinstance(fake_channel.wavelength_response(), u.Quantity)
 
 
+@pytest.mark.parametrize('channel', [TestChannel(), DegradingTestChannel()])
+def test_wavelength_response_array_obstime(channel):
+    obstime = parse_time('2015-01-01') + np.arange(3) * u.yr
+    wave_response = channel.wavelength_response(obstime=obstime)
+    assert wave_response.shape == obstime.shape + channel.wavelength.shape
+    for time, response in zip(obstime, wave_response):
+        assert u.allclose(response, channel.wavelength_response(obstime=time))
+
+
+class TimeDegradingTestChannel(TestChannel):
+    """
+    A channel with a degradation that only depends on time.
+    """
+
+    @u.quantity_input
+    def degradation(self, obstime=None) -> u.dimensionless_unscaled:
+        if obstime is None:
+            return 1.0
+        return np.exp(-(parse_time(obstime) - parse_time('2010-01-01')).to_value('yr') / 10)
+
+
+def test_wavelength_response_time_degradation():
+    # The number of times is the same as the number of wavelengths, such that the
+    # shape of the degradation is the same as that of the wavelength
+    channel = TimeDegradingTestChannel()
+    obstime = parse_time('2015-01-01') + np.arange(channel.wavelength.size) * u.day
+    wave_response = channel.wavelength_response(obstime=obstime)
+    assert wave_response.shape == obstime.shape + channel.wavelength.shape
+    for i in [0, 50, -1]:
+        assert u.allclose(wave_response[i], channel.wavelength_response(obstime=obstime[i]))
+
+
+def test_wavelength_response_degradation_shape():
+    channel = DegradingTestChannel()
+    channel.degradation = lambda obstime=None: np.ones((2, 3, 4))
+    with pytest.raises(ValueError, match="The degradation must have shape"):
+        channel.wavelength_response(obstime=parse_time('2015-01-01') + np.arange(2) * u.yr)
+
+
+def test_wavelength_response_cache(fake_channel):
+    wave_response = fake_channel.wavelength_response()
+    assert '_undegraded_effective_area' in fake_channel.__dict__
+    fake_channel.clear_cache()
+    assert '_undegraded_effective_area' not in fake_channel.__dict__
+    assert u.allclose(fake_channel.wavelength_response(), wave_response)
+
+
 @pytest.fixture
 def fake_spectra():
     temperature = np.logspace(5, 8, 100) * u.K
@@ -90,3 +148,165 @@ def test_temperature_response(fake_channel, fake_spectra, obstime):
     temp_response = fake_spectra.temperature_response(fake_channel, obstime=obstime)
     assert isinstance(temp_response, u.Quantity)
     assert temp_response.shape == fake_spectra.temperature.shape
+
+
+class OtherTestChannel(TestChannel):
+    @property
+    @u.quantity_input
+    def wavelength(self) -> u.Angstrom:
+        return np.linspace(140, 160, 50) * u.AA
+
+
+@pytest.mark.parametrize('obstime', [None, '2020-01-01'])
+def test_temperature_responses(fake_channel, fake_spectra, obstime):
+    channels = [fake_channel, OtherTestChannel()]
+    temp_responses = fake_spectra.temperature_responses(channels, obstime=obstime)
+    assert isinstance(temp_responses, u.Quantity)
+    assert temp_responses.shape == (len(channels),) + fake_spectra.temperature.shape
+    for channel, temp_response in zip(channels, temp_responses):
+        assert u.allclose(temp_response,
+                          fake_spectra.temperature_response(channel, obstime=obstime))
+
+
+def test_temperature_response_matches_xarray(fake_channel, fake_spectra):
+    # Check the cached quadrature weights against interpolating and integrating with xarray
+    wave_response = fake_channel.wavelength_response()
+    spec_interp = fake_spectra._da.interp(
+        wavelength=fake_channel.wavelength.to_value('Angstrom'),
+        kwargs={'bounds_error': False, 'fill_value': 0.0},
+    )
+    expected = (spec_interp * wave_response.value).integrate(coord='wavelength')
+    temp_response = fake_spectra.temperature_response(fake_channel)
+    assert np.allclose(temp_response.value, expected.data)
+    assert len(fake_spectra._weights_cache) == 1
+    fake_spectra.temperature_response(fake_channel)
+    assert len(fake_spectra._weights_cache) == 1
+
+
+def test_temperature_response_time_series(fake_channel, fake_spectra):
+    channel = DegradingTestChannel()
+    obstime = parse_time('2015-01-01') + np.arange(5) * u.yr
+    temperature, temp_response = get_temperature_response(channel, fake_spectra, obstime=obstime)
+    assert temp_response.shape == obstime.shape + temperature.shape
+    for time, response in zip(obstime, temp_response):
+        assert u.allclose(response, fake_spectra.temperature_response(channel, obstime=time))
+    temp_responses = fake_spectra.temperature_responses([channel, fake_channel], obstime=obstime)
+    assert temp_responses.shape == (2,) + obstime.shape + temperature.shape
+    assert u.allclose(temp_responses[0], temp_response)
+
+
+class ContaminatedTestChannel(DegradingTestChannel):
+    """
+    A channel which overrides the effective area with an additional time-dependent contamination.
+    """
+
+    @u.quantity_input
+    def effective_area(self, obstime=None) -> u.cm**2:
+        area = super().effective_area(obstime=obstime)
+        if obstime is None:
+            return area
+        elapsed = (parse_time(obstime) - parse_time('2010-01-01')).to_value('yr')
+        return area * np.exp(-0.1 * elapsed)[..., np.newaxis]
+
+
+def test_temperature_response_time_series_override(fake_spectra):
+    channel = ContaminatedTestChannel()
+    obstime = parse_time('2015-01-01') + np.arange(3) * u.yr
+    temp_response = fake_spectra.temperature_response(channel, obstime=obstime)
+    for time, response in zip(obstime, temp_response):
+        assert u.allclose(response, fake_spectra.temperature_response(channel, obstime=time))
+        assert u.allclose(response, fake_spectra.temperature_response(channel, obstime=[time])[0])
+    # The contamination is included
+    assert not u.allclose(temp_response, fake_spectra.temperature_response(DegradingTestChannel(), obstime=obstime))
+
+
+def test_temperature_response_chunked(fake_channel, fake_spectra):
+    chunked_spectra = SourceSpectra(
+        fake_spectra.temperature,
+        fake_spectra.wavelength,
+        fake_spectra.data,
+        density=fake_spectra.density,
+        chunks={'wavelength': 100},
+    )
+    assert chunked_spectra._da.chunks is not None
+    assert u.allclose(chunked_spectra.temperature_response(fake_channel),
+                      fake_spectra.temperature_response(fake_channel))
+    obstime = parse_time('2015-01-01') + np.arange(3) * u.yr
+    channel = DegradingTestChannel()
+    assert u.allclose(chunked_spectra.temperature_response(channel, obstime=obstime),
+                      fake_spectra.temperature_response(channel, obstime=obstime))
+
+
+@pytest.mark.parametrize('obstime', [None, parse_time('2015-01-01') + np.arange(3) * u.yr])
+def test_temperature_response_threshold(fake_spectra, obstime, caplog):
+    channel = DegradingTestChannel()
+    temp_response = fake_spectra.temperature_response(channel, obstime=obstime)
+    temp_response_truncated = fake_spectra.temperature_response(channel, obstime=obstime, threshold=1e-6)
+    assert u.allclose(temp_response_truncated, temp_response, rtol=1e-5)
+    assert 'estimated relative error' in caplog.text
+    temp_responses = fake_spectra.temperature_responses([channel], obstime=obstime, threshold=1e-6)
+    assert u.allclose(temp_responses[0], temp_response_truncated)
+
+
+@pytest.mark.parametrize('threshold', [-0.1, 1, 2.0])
+def test_temperature_response_threshold_invalid(fake_spectra, fake_channel, threshold):
+    with pytest.raises(ValueError, match="The threshold must be at least 0 and less than 1"):
+        fake_spectra.temperature_response(fake_channel, threshold=threshold)
+
+
+def test_temperature_response_density(fake_channel):
+    temperature = np.logspace(5, 8, 20) * u.K
+    density = np.logspace(8, 12, 5) * u.cm**(-3)
+    wavelength = np.linspace(50, 250, 1000) * u.AA
+    data = np.random.rand(*temperature.shape + density.shape + wavelength.shape) * u.Unit(
+        "photon cm3 s-1 sr-1 Angstrom-1"
+    )
+    spectra = SourceSpectra(temperature, wavelength, data, density=density)
+    temp_response = spectra.temperature_response(fake_channel)
+    assert temp_response.shape == temperature.shape + density.shape
+    for i in range(density.shape[0]):
+        spectra_single = SourceSpectra(temperature, wavelength, data[:, i, :])
+        assert u.allclose(temp_response[:, i], spectra_single.temperature_response(fake_channel))
+    temp_responses = spectra.temperature_responses([fake_channel, OtherTestChannel()])
+    assert temp_responses.shape == (2,) + temperature.shape + density.shape
+    obstime = parse_time('2015-01-01') + np.arange(3) * u.yr
+    temp_response_time = spectra.temperature_response(DegradingTestChannel(), obstime=obstime)
+    assert temp_response_time.shape == obstime.shape + temperature.shape + density.shape
+
+
+@pytest.mark.parametrize('dtype', [None, np.float32])
+def test_response_table(fake_channel, fake_spectra, dtype, tmp_path):
+    channels = [fake_channel, OtherTestChannel()]
+    table = ResponseTable.from_spectra(fake_spectra, channels, names=['a', 'b'], dtype=dtype)
+    assert table.channels == ['a', 'b']
+    assert table.response.shape == (2,) + fake_spectra.temperature.shape
+    assert u.allclose(table.response, fake_spectra.temperature_responses(channels), rtol=1e-6)
+    if dtype is not None:
+        assert table.response.dtype == dtype
+    # Regridding onto the same grid should not change the response
+    assert u.allclose(table.regrid(table.temperature).response, table.response)
+    new_temperature = np.logspace(4, 9, 50) * u.K
+    table_regrid = table.regrid(new_temperature)
+    assert table_regrid.response.shape == (2,) + new_temperature.shape
+    assert np.all(table_regrid.response[:, new_temperature < table.temperature[0]] == 0)
+    filename = tmp_path / 'table.nc'
+    table.save(filename)
+    table_loaded = ResponseTable.load(filename)
+    assert table_loaded.channels == table.channels
+    assert u.allclose(table_loaded.temperature, table.temperature)
+    assert u.allclose(table_loaded.response, table.response)
+    assert table_loaded.response.dtype == table.response.dtype
+
+
+def test_temperature_responses_no_channels(fake_spectra):
+    with pytest.raises(ValueError, match="At least one channel must be given"):
+        fake_spectra.temperature_responses([])
+
+
+def test_response_table_invalid(fake_channel, fake_spectra):
+    obstime = parse_time('2015-01-01') + np.arange(3) * u.yr
+    with pytest.raises(ValueError, match="The observation time must be a single time"):
+        ResponseTable.from_spectra(fake_spectra, [DegradingTestChannel()], obstime=obstime)
+    table = ResponseTable.from_spectra(fake_spectra, [fake_channel])
+    with pytest.raises(ValueError, match="The temperature must be a 1D array"):
+        table.regrid(np.logspace(4, 9, 50).reshape(5, 10) * u.K)
@@ -38,3 +38,34 @@ def test_create_source_spectra(density, meta):
     else:
         with pytest.raises(ValueError, match="No density data available."):
             spec.density
+
+
+@pytest.mark.parametrize('chunks', [None, {'wavelength': 10}])
+def test_save_load_source_spectra(tmp_path, chunks):
+    temperature = np.logspace(4, 9, 100) * u.K
+    wavelength = np.linspace(1, 1000, 50) * u.Angstrom
+    density = 1e15 * u.K / u.cm**3 / temperature
+    data = np.random.rand(*temperature.shape + wavelength.shape) * u.Unit("photon cm3 s-1 sr-1 Angstrom-1")
+    spec = SourceSpectra(temperature, wavelength, data, density=density, meta={'abundance_model': 'test'})
+    filename = tmp_path / 'spectra.nc'
+    spec.save(filename)
+    spec_loaded = SourceSpectra.load(filename, chunks=chunks)
+    assert spec_loaded.meta == spec.meta
+    assert u.allclose(spec_loaded.temperature, spec.temperature)
+    assert u.allclose(spec_loaded.wavelength, spec.wavelength)
+    assert u.allclose(spec_loaded.density, spec.density)
+    assert u.allclose(spec_loaded.data, spec.data)
+    assert (spec_loaded._da.chunks is None) == (chunks is None)
+
+
+def test_create_source_spectra_density_axis():
+    temperature = np.logspace(4, 9, 100) * u.K
+    density = np.logspace(8, 12, 5) * u.cm**(-3)
+    wavelength = np.linspace(1, 1000, 50) * u.Angstrom
+    data_shape = temperature.shape + density.shape + wavelength.shape
+    data = np.random.rand(*data_shape) * u.Unit("photon cm3 s-1 sr-1 Angstrom-1")
+    spec = SourceSpectra(temperature, wavelength, data, density=density)
+    assert spec.data.shape == data_shape
+    assert spec.density.shape == density.shape
+    with pytest.raises(ValueError, match="Density must be specified for a 3D spectra."):
+        SourceSpectra(temperature, wavelength, data)
@@ -1,14 +1,19 @@
 """
 Classes for computing the temperature response
 """
+import numpy as np
 import xarray
+from scipy import sparse
 
 import astropy.units as u
 
-__all__ = ["SourceSpectra", "get_temperature_response"]
+from sunpy import log
+from sunpy.time import parse_time
 
+__all__ = ["SourceSpectra", "ResponseTable", "get_temperature_response"]
 
-def get_temperature_response(channel, spectra, obstime=None):
+
+def get_temperature_response(channel, spectra, obstime=None, threshold=None):
     """
     Calculate the temperature response function for a given instrument channel
     and input spectra.
@@ -18,17 +23,23 @@ def get_temperature_response(channel, spectra, obstime=None):
     channel: `~sunkit_instruments.response.abstractions.AbstractChannel`
     spectra: `~sunkit_instruments.response.SourceSpectra`
     obstime: any format parsed by `sunpy.time.parse_time` , optional
+        If this is an array of times, the response is computed for every time.
+    threshold: `float`, optional
+        If specified, only the part of the spectra where the wavelength response
+        exceeds this fraction of its maximum is used. This must be at least 0 and
+        less than 1.
 
     Returns
     -------
     temperature: `~astropy.units.Quantity`
     response: `~astropy.units.Quantity`
+        If ``obstime`` is an array, the first axis of the response corresponds to time.
 
     See Also
     --------
     sunkit_instruments.response.SourceSpectra.temperature_response
     """
-    return spectra.temperature, spectra.temperature_response(channel, obstime=obstime)
+    return spectra.temperature, spectra.temperature_response(channel, obstime=obstime, threshold=threshold)
 
 
 class SourceSpectra:
@@ -49,12 +60,19 @@ class SourceSpectra:
         1D array describing the variation along the wavelength axis.
     spectra: `~astropy.units.Quantity`
         Source spectra as a 2D array. The first axis should correspond to temperature and the
-        second axis should correspond to wavelength.
+        second axis should correspond to wavelength. Alternatively, this can be a 3D array
+        where the axes correspond to temperature, density, and wavelength.
     density: `~astropy.units.Quantity`, optional
         1D array describing the variation in density along the temperature axis. It is assumed
-        that temperature and density are dependent.
+        that temperature and density are dependent. If ``spectra`` is a 3D array, this is
+        required and instead describes an independent density axis.
     meta: `dict`, optional
         Any optional metadata to attach to the spectra, e.g. abundance model, CHIANTI version.
+    chunks: `int`, `dict`, optional
+        If specified, the spectra are stored as a chunked dask array. This is passed
+        to `xarray.DataArray.chunk`, e.g. ``{"wavelength": 10000}``. When computing
+        the temperature response, the spectra are integrated one wavelength chunk at a
+        time such that only a single chunk is held in memory.
     """
 
     @u.quantity_input
@@ -65,6 +83,7 @@ class SourceSpectra:
         spectra: u.photon * u.cm**3 / (u.s * u.Angstrom * u.steradian),
         density: u.cm ** (-3) = None,
         meta=None,
+        chunks=None,
     ):
         self.meta = meta
         coords = {
@@ -79,16 +98,24 @@ class SourceSpectra:
                 attrs={"unit": wavelength.unit.to_string()},
             ),
         }
+        dims = ["temperature", "wavelength"]
+        if spectra.ndim == 3:
+            if density is None:
+                raise ValueError("Density must be specified for a 3D spectra.")
+            dims = ["temperature", "density", "wavelength"]
         if density is not None:
             coords["density"] = xarray.Variable(
-                "temperature", density.value, attrs={"unit": density.unit.to_string()}
+                dims[-2], density.value, attrs={"unit": density.unit.to_string()}
             )
         self._da = xarray.DataArray(
             spectra.data,
-            dims=["temperature", "wavelength"],
+            dims=dims,
             coords=coords,
             attrs={"unit": spectra.unit.to_string(), **self.meta},
         )
+        if chunks is not None:
+            self._da = self._da.chunk(chunks)
+        self._weights_cache = {}
 
     def __repr__(self):
         return self._da.__repr__()
@@ -135,9 +162,70 @@ class SourceSpectra:
     def data(self) -> u.photon * u.cm**3 / (u.s * u.Angstrom * u.steradian):
         return u.Quantity(self._da.data, self._da.attrs["unit"])
 
+    def save(self, filename, **kwargs):
+        """
+        Save the source spectra to a netCDF file.
+
+        The temperature, wavelength, and density coordinates, the units and
+        the metadata are all stored in the file. Note that the values in
+        `meta` must be types that can be stored as netCDF attributes, e.g.
+        strings, numbers, or 1D arrays.
+
+        Parameters
+        ----------
+        filename: path-like
+            Path to the output file.
+        kwargs:
+            Any additional keyword arguments are passed to
+            `xarray.DataArray.to_netcdf`, e.g. ``engine``.
+
+        See Also
+        --------
+        load
+        """
+        self._da.to_netcdf(filename, **kwargs)
+
+    @classmethod
+    def load(cls, filename, chunks=None, **kwargs):
+        """
+        Load source spectra from a netCDF file written by `save`.
+
+        The spectra are not read into memory when the file is opened. Instead,
+        only the parts of the spectra needed for a given calculation are read
+        from the file. As such, many processes can share a single file without
+        each holding a copy of the full spectra in memory. For netCDF3 files,
+        the file can also be memory-mapped by passing ``engine="scipy", mmap=True``.
+
+        Parameters
+        ----------
+        filename: path-like
+            Path to the file.
+        chunks: `int`, `dict`, optional
+            If specified, the spectra are loaded as a chunked dask array.
+            See `SourceSpectra` for more details.
+        kwargs:
+            Any additional keyword arguments are passed to `xarray.open_dataarray`.
+
+        Returns
+        -------
+        `SourceSpectra`
+        """
+        return cls._from_dataarray(xarray.open_dataarray(filename, chunks=chunks, **kwargs))
+
+    @classmethod
+    def _from_dataarray(cls, da):
+        """
+        Create source spectra directly from a `xarray.DataArray` with the same layout as ``_da``.
+        """
+        spectra = cls.__new__(cls)
+        spectra.meta = {k: v for k, v in da.attrs.items() if k != "unit"}
+        spectra._da = da
+        spectra._weights_cache = {}
+        return spectra
+
     @u.quantity_input
     def temperature_response(
-        self, channel, obstime=None
+        self, channel, obstime=None, threshold=None
     ) -> u.cm**5 * u.DN / (u.pixel * u.s):
         """
         Temperature response function for a given instrument channel.
@@ -154,24 +242,418 @@ class SourceSpectra:
             response function.
         obstime: any format parsed by `sunpy.time.parse_time`, optional
             A time of a particular observation. This is used to calculated any
-            time-dependent instrument degradation.
+            time-dependent instrument degradation. If this is an array of times,
+            the spectra are integrated only once, and the wavelength response at
+            each time is then applied.
+        threshold: `float`, optional
+            If specified, the wavelength response is truncated to the range of
+            wavelengths over which it exceeds this fraction of its maximum value,
+            which must be at least 0 and less than 1, such that only this part of
+            the spectra is integrated. For narrowband channels, this greatly
+            reduces the size of the spectra that is read.
+            The estimated relative error due to the truncation is logged.
+
+        Returns
+        -------
+        `~astropy.units.Quantity`
+            Temperature response with shape ``temperature.shape`` or
+            ``obstime.shape + temperature.shape`` if ``obstime`` is an array.
+            If the spectra has an independent density axis, the response has an
+            additional trailing axis corresponding to density.
+        """
+        if obstime is not None:
+            obstime = parse_time(obstime)
+            if not obstime.isscalar:
+                return self._temperature_response_time_series(channel, obstime, threshold)
+        wave_response = channel.wavelength_response(obstime=obstime)
+        if threshold is not None:
+            wave_response = _truncate_wavelength_response(wave_response, channel.wavelength, threshold)
+        weights = self._quadrature_weights(channel.wavelength)
+        kernel = weights.T @ wave_response.to_value(wave_response.unit)
+        temp_response = self._integrate(kernel)
+        final_unit = u.Unit(self._da.attrs['unit']) * wave_response.unit * u.Angstrom
+        return u.Quantity(temp_response, final_unit)
+
+    @u.quantity_input
+    def temperature_responses(
+        self, channels, obstime=None, threshold=None
+    ) -> u.cm**5 * u.DN / (u.pixel * u.s):
+        """
+        Temperature response functions for several instrument channels at once.
+
+        Rather than integrating the source spectra separately for each channel,
+        the quadrature kernels of all channels are stacked such that the weighted
+        integral over wavelength is evaluated for all channels in a single pass
+        over the spectra.
+
+        Parameters
+        ----------
+        channels: `list` of `~sunkit_instruments.response.abstractions.AbstractChannel`
+            The instrument channels used to compute the wavelength response functions.
+            At least one channel must be given.
+        obstime: any format parsed by `sunpy.time.parse_time`, optional
+            A time of a particular observation. This is used to calculated any
+            time-dependent instrument degradation. If this is an array of times,
+            the response is computed for every time.
+        threshold: `float`, optional
+            If specified, the wavelength response of each channel is truncated.
+            See `temperature_response` for more details.
+
+        Returns
+        -------
+        `~astropy.units.Quantity`
+            Temperature response with shape ``(len(channels),) + temperature.shape``
+            or ``(len(channels),) + obstime.shape + temperature.shape`` if ``obstime``
+            is an array. If the spectra has an independent density axis, the response
+            has an additional trailing axis corresponding to density.
+
+        See Also
+        --------
+        temperature_response
+        """
+        channels = list(channels)
+        if not channels:
+            raise ValueError("At least one channel must be given.")
+        if obstime is not None:
+            obstime = parse_time(obstime)
+            if not obstime.isscalar:
+                return u.Quantity([self._temperature_response_time_series(channel, obstime, threshold)
+                                   for channel in channels])
+        wave_responses = [channel.wavelength_response(obstime=obstime) for channel in channels]
+        if threshold is not None:
+            wave_responses = [_truncate_wavelength_response(wave_response, channel.wavelength, threshold)
+                              for channel, wave_response in zip(channels, wave_responses)]
+        response_unit = wave_responses[0].unit
+        # Each column is the weighted quadrature kernel of one channel on the wavelength
+        # grid of the source spectra such that all channels are integrated in one product.
+        kernels = np.stack([
+            self._quadrature_weights(channel.wavelength).T @ wave_response.to_value(response_unit)
+            for channel, wave_response in zip(channels, wave_responses)
+        ], axis=-1)
+        temp_response = self._integrate(kernels)
+        final_unit = u.Unit(self._da.attrs['unit']) * response_unit * u.Angstrom
+        return u.Quantity(np.moveaxis(temp_response, -1, 0), final_unit)
+
+    def _temperature_response_time_series(self, channel, obstime, threshold=None):
+        """
+        Temperature response for an array of observation times.
+
+        The spectra, interpolated onto the channel wavelength grid, are integrated
+        once for every wavelength of the channel. The response at each time is then
+        a weighted sum of these, with the wavelength response of the channel at that
+        time as the weights. The wavelength response is calculated for all times at once
+        with `~sunkit_instruments.response.abstractions.AbstractChannel.wavelength_response`,
+        such that the same response is used as for a single time.
         """
         wave_response = channel.wavelength_response(obstime=obstime)
-        da_response = xarray.DataArray(
-            wave_response.to_value(wave_response.unit),
-            dims=['wavelength'],
-            coords=[xarray.Variable('wavelength',
-                                   channel.wavelength.to_value('Angstrom'),
-                                   attrs={'unit': 'Angstrom'}),],
-            attrs={'unit': wave_response.unit.to_string()}
+        if threshold is not None:
+            wave_response = _truncate_wavelength_response(wave_response, channel.wavelength, threshold)
+        wave_response = wave_response.reshape(obstime.shape + channel.wavelength.shape)
+        weights = self._quadrature_weights(channel.wavelength)
+        partial_response = self._integrate(weights.T)
+        temp_response = partial_response @ wave_response.value.reshape(-1, wave_response.shape[-1]).T
+        final_unit = u.Unit(self._da.attrs['unit']) * wave_response.unit * u.Angstrom
+        temp_response = np.moveaxis(temp_response, -1, 0).reshape(obstime.shape + temp_response.shape[:-1])
+        return u.Quantity(temp_response, final_unit)
+
+    def _quadrature_weights(self, wavelength):
+        """
+        Sparse matrix that linearly interpolates the spectra onto ``wavelength`` and
+        applies the trapezoidal quadrature weights of that grid.
+
+        For a wavelength response ``R`` defined on ``wavelength``, ``weights.T @ R``
+        is the kernel that, when contracted with the spectra along the wavelength
+        axis, gives the temperature response. The matrix only depends on the
+        wavelength grid so it is cached.
+        """
+        wavelength = np.ascontiguousarray(wavelength.to_value('Angstrom'), dtype=float)
+        key = wavelength.tobytes()
+        if key not in self._weights_cache:
+            interp = _linear_interpolation_matrix(self.wavelength.to_value('Angstrom'), wavelength)
+            self._weights_cache[key] = sparse.diags_array(_trapezoid_weights(wavelength)) @ interp
+        return self._weights_cache[key]
+
+    def _integrate(self, kernel):
+        """
+        Contract the spectra with ``kernel`` along the wavelength axis.
+
+        The kernel can be either a dense or a sparse array. Only the range of
+        wavelengths over which the kernel is nonzero is selected such that the
+        rest of the spectra is never touched. If the spectra are chunked, the
+        contraction is accumulated over the wavelength chunks.
+        """
+        shape = tuple(self._da.sizes[dim] for dim in self._da.dims if dim != 'wavelength')
+        if sparse.issparse(kernel):
+            kernel = sparse.csr_array(kernel)
+            (nonzero,) = np.nonzero(np.diff(kernel.indptr))
+        else:
+            (nonzero,) = np.nonzero(kernel.reshape(kernel.shape[0], -1).any(axis=1))
+        temp_response = np.zeros(shape + kernel.shape[1:])
+        if nonzero.size == 0:
+            return temp_response
+        support = slice(nonzero[0], nonzero[-1] + 1)
+        da_support = self._da.isel(wavelength=support)
+        kernel = kernel[support]
+        if da_support.chunks is None:
+            bounds = [0, da_support.sizes['wavelength']]
+        else:
+            bounds = np.cumsum([0, *da_support.chunksizes['wavelength']])
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            data = da_support.isel(wavelength=slice(start, stop)).values
+            temp_response += _contract(data, kernel[start:stop])
+        return temp_response
+
+
+def _contract(data, kernel):
+    """
+    Contract the last axis of ``data`` with the first axis of a dense or sparse ``kernel``.
+    """
+    if sparse.issparse(kernel):
+        flat = data.reshape(-1, data.shape[-1])
+        return (kernel.T @ flat.T).T.reshape(data.shape[:-1] + kernel.shape[1:])
+    return data @ kernel
+
+
+def _truncate_wavelength_response(wave_response, wavelength, threshold):
+    """
+    Set the wavelength response to zero outside of the range of wavelengths
+    where it exceeds ``threshold`` times its maximum.
+
+    The relative truncation error is estimated as the fraction of the integrated
+    wavelength response that is discarded. This is the exact relative error in the
+    temperature response for a source spectra that is flat in wavelength.
+    """
+    if not 0 <= threshold < 1:
+        raise ValueError(f"The threshold must be at least 0 and less than 1, not {threshold}.")
+    magnitude = np.abs(wave_response.value).reshape(-1, wave_response.shape[-1]).max(axis=0)
+    (above,) = np.nonzero(magnitude > threshold * magnitude.max())
+    window = np.zeros(magnitude.shape, dtype=bool)
+    if above.size:
+        window[above[0]:above[-1] + 1] = True
+    weights = np.abs(_trapezoid_weights(wavelength.to_value('Angstrom'))) * magnitude
+    error = weights[~window].sum() / weights.sum() if weights.sum() else 0.0
+    log.info(f"Truncated wavelength response to {window.sum()} of {window.size} wavelengths "
+             f"with an estimated relative error of {error:.3g}")
+    return np.where(window, wave_response, 0 * wave_response.unit)
+
+
+def _trapezoid_weights(x):
+    """
+    Weights such that ``_trapezoid_weights(x) @ y`` is the trapezoidal integral of ``y`` over ``x``.
+    """
+    weights = np.zeros(x.shape)
+    if x.size > 1:
+        dx = np.diff(x) / 2
+        weights[:-1] += dx
+        weights[1:] += dx
+    return weights
+
+
+def _linear_interpolation_matrix(x, x_new):
+    """
+    Sparse matrix ``M`` such that ``M @ y`` linearly interpolates ``y(x)`` onto ``x_new``.
+
+    Points in ``x_new`` outside of the range of ``x`` are set to zero, consistent
+    with `scipy.interpolate.interp1d` with ``bounds_error=False, fill_value=0``.
+    """
+    sorter = np.argsort(x)
+    x_sorted = x[sorter]
+    upper = np.clip(np.searchsorted(x_sorted, x_new), 1, x.size - 1)
+    lower = upper - 1
+    slope = (x_new - x_sorted[lower]) / (x_sorted[upper] - x_sorted[lower])
+    in_bounds = (x_new >= x_sorted[0]) & (x_new <= x_sorted[-1])
+    rows = np.flatnonzero(in_bounds)
+    data = np.concatenate([1 - slope[rows], slope[rows]])
+    indices = (np.concatenate([sorter[lower[rows]], sorter[upper[rows]]]),)
+    return sparse.csr_array(
+        (data, (np.concatenate([rows, rows]),) + indices),
+        shape=(x_new.size, x.size),
+    )
+
+
+class ResponseTable:
+    """
+    Precomputed temperature response functions for a set of instrument channels.
+
+    The temperature responses of all channels are stored together as a
+    (channel x temperature) kernel matrix, e.g. as needed for a differential
+    emission measure inversion. Once the table has been built, the source
+    spectra are no longer needed to evaluate the response.
+
+    Parameters
+    ----------
+    temperature: `~astropy.units.Quantity`
+        1D array describing the variation along the temperature axis.
+    response: `~astropy.units.Quantity`
+        Temperature response as a 2D array. The first axis should correspond to channel
+        and the second axis should correspond to temperature.
+    channels: `list` of `str`, optional
+        Names of each channel. Defaults to the index of each channel.
+    meta: `dict`, optional
+        Any optional metadata to attach to the table.
+    dtype: data-type, optional
+        If specified, the response is stored with this type, e.g. ``numpy.float32``
+        to halve the size of the table.
+
+    See Also
+    --------
+    ResponseTable.from_spectra
+    """
+
+    @u.quantity_input
+    def __init__(
+        self,
+        temperature: u.K,
+        response: u.cm**5 * u.DN / (u.pixel * u.s),
+        channels=None,
+        meta=None,
+        dtype=None,
+    ):
+        if response.ndim != 2 or response.shape[1:] != temperature.shape:
+            raise ValueError("Response must have shape (number of channels,) + temperature.shape")
+        if channels is None:
+            channels = [str(i) for i in range(response.shape[0])]
+        self.meta = meta
+        self._da = xarray.DataArray(
+            response.value if dtype is None else response.value.astype(dtype),
+            dims=["channel", "temperature"],
+            coords={
+                "channel": xarray.Variable("channel", list(channels)),
+                "temperature": xarray.Variable(
+                    "temperature",
+                    temperature.value,
+                    attrs={"unit": temperature.unit.to_string()},
+                ),
+            },
+            attrs={"unit": response.unit.to_string(), **self.meta},
         )
-        spec_interp = self._da.interp(
-            wavelength=da_response.wavelength,
-            kwargs={'bounds_error': False, 'fill_value': 0.0},
+
+    @classmethod
+    def from_spectra(cls, spectra, channels, obstime=None, names=None, dtype=None, threshold=None):
+        """
+        Build the table from source spectra and a set of instrument channels.
+
+        Parameters
+        ----------
+        spectra: `~sunkit_instruments.response.SourceSpectra`
+        channels: `list` of `~sunkit_instruments.response.abstractions.AbstractChannel`
+        obstime: any format parsed by `sunpy.time.parse_time`, optional
+            A time of a particular observation. This is used to calculated any
+            time-dependent instrument degradation. This must be a single time.
+        names: `list` of `str`, optional
+            Names of each channel. Defaults to the index of each channel.
+        dtype: data-type, optional
+            If specified, the response is stored with this type.
+        threshold: `float`, optional
+            See `~sunkit_instruments.response.SourceSpectra.temperature_response`.
+
+        Returns
+        -------
+        `ResponseTable`
+        """
+        if obstime is not None and not parse_time(obstime).isscalar:
+            raise ValueError("The observation time must be a single time, not an array of times.")
+        response = spectra.temperature_responses(channels, obstime=obstime, threshold=threshold)
+        return cls(spectra.temperature, response, channels=names, meta=dict(spectra.meta), dtype=dtype)
+
+    def __repr__(self):
+        return self._da.__repr__()
+
+    def __str__(self):
+        return self._da.__str__()
+
+    def _repr_html_(self):
+        return self._da._repr_html_()
+
+    @property
+    def meta(self):
+        return self._meta
+
+    @meta.setter
+    def meta(self, x):
+        if x is None:
+            self._meta = {}
+        elif isinstance(x, dict):
+            self._meta = x
+        else:
+            raise TypeError(f'Unsupported metadata type {type(x)}')
+
+    @property
+    def channels(self):
+        return [str(channel) for channel in self._da.channel.data]
+
+    @property
+    @u.quantity_input
+    def temperature(self) -> u.K:
+        return u.Quantity(self._da.temperature.data, self._da.temperature.attrs["unit"])
+
+    @property
+    @u.quantity_input
+    def response(self) -> u.cm**5 * u.DN / (u.pixel * u.s):
+        return u.Quantity(self._da.data, self._da.attrs["unit"], copy=False)
+
+    @u.quantity_input
+    def regrid(self, temperature: u.K):
+        """
+        Interpolate the table onto a new temperature grid.
+
+        The response is linearly interpolated in the logarithm of the temperature.
+        The response is zero at temperatures outside of the range of the table.
+
+        Parameters
+        ----------
+        temperature: `~astropy.units.Quantity`
+            The new temperature grid, as a 1D array.
+
+        Returns
+        -------
+        `ResponseTable`
+        """
+        if temperature.ndim != 1:
+            raise ValueError(f"The temperature must be a 1D array, not an array with shape {temperature.shape}.")
+        log_temperature = np.log10(self.temperature.to_value('K'))
+        interp = _linear_interpolation_matrix(log_temperature,
+                                              np.log10(temperature.to_value('K')))
+        response = (interp @ self._da.data.T).T.astype(self._da.dtype)
+        return type(self)(temperature,
+                          u.Quantity(response, self._da.attrs["unit"]),
+                          channels=self.channels,
+                          meta=dict(self.meta))
+
+    def save(self, filename, **kwargs):
+        """
+        Save the table to a netCDF file.
+
+        Parameters
+        ----------
+        filename: path-like
+            Path to the output file.
+        kwargs:
+            Any additional keyword arguments are passed to
+            `xarray.DataArray.to_netcdf`, e.g. ``engine``.
+        """
+        self._da.to_netcdf(filename, **kwargs)
+
+    @classmethod
+    def load(cls, filename, **kwargs):
+        """
+        Load a table from a netCDF file written by `save`.
+
+        Parameters
+        ----------
+        filename: path-like
+            Path to the file.
+        kwargs:
+            Any additional keyword arguments are passed to `xarray.load_dataarray`.
+
+        Returns
+        -------
+        `ResponseTable`
+        """
+        da = xarray.load_dataarray(filename, **kwargs)
+        return cls(
+            u.Quantity(da.temperature.data, da.temperature.attrs["unit"]),
+            u.Quantity(da.data, da.attrs["unit"]),
+            channels=[str(channel) for channel in da.channel.data],
+            meta={k: v for k, v in da.attrs.items() if k != "unit"},
         )
-        spec_interp_weighted = spec_interp * da_response
-        temp_response = spec_interp_weighted.integrate(coord='wavelength')
-        final_unit = (u.Unit(spec_interp.unit)
-                      * u.Unit(da_response.attrs['unit'])
-                      * u.Unit(spec_interp_weighted.wavelength.unit))
-        return u.Quantity(temp_response.data, final_unit)